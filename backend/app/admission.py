@@ -0,0 +1,228 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from flask import current_app, g, jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBucketStore:
+    """
+    Seaux à jetons en mémoire du processus (un seau par client et par
+    route), en nombre borné : les seaux les moins récemment utilisés sont
+    oubliés.
+    """
+
+    def __init__(self, max_buckets=100000):
+        self.max_buckets = max_buckets
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def consume(self, key, rate, burst):
+        """
+        Returns:
+            (bool, float): requête admise, délai avant le prochain jeton
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+
+class RedisBucketStore:
+    """
+    Seaux à jetons partagés entre workers (script Lua atomique). En cas
+    d'indisponibilité de Redis, les seaux locaux prennent le relais.
+    """
+
+    SCRIPT = """
+    local now_parts = redis.call('TIME')
+    local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    local retry_after = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    else
+        retry_after = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(retry_after)}
+    """
+
+    def __init__(self, redis_client, fallback=None, prefix='admission:'):
+        self._script = redis_client.register_script(self.SCRIPT)
+        self._fallback = fallback or LocalBucketStore()
+        self._prefix = prefix
+
+    def consume(self, key, rate, burst):
+        try:
+            allowed, retry_after = self._script(keys=[self._prefix + key], args=[rate, burst])
+            return bool(allowed), float(retry_after)
+        except Exception:
+            logger.warning("Redis indisponible pour la limitation de débit, seaux locaux utilisés", exc_info=True)
+            return self._fallback.consume(key, rate, burst)
+
+
+class ConcurrencyLimiter:
+    """
+    Limite globale de requêtes coûteuses simultanées, avec une file
+    d'attente bornée : au-delà de la file, ou après le délai d'attente,
+    la requête est rejetée.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+
+    def acquire(self, max_concurrent, max_queue, timeout):
+        """
+        Returns:
+            str: 'admitted', 'queued' (admise après attente), 'rejected' ou 'timeout'
+        """
+        with self._condition:
+            if self.active < max_concurrent:
+                self.active += 1
+                return 'admitted'
+            if self.waiting >= max_queue:
+                return 'rejected'
+
+            self.waiting += 1
+            try:
+                if not self._condition.wait_for(lambda: self.active < max_concurrent, timeout):
+                    return 'timeout'
+                self.active += 1
+                return 'queued'
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+
+class AdmissionController:
+    """
+    Contrôle d'admission du blueprint : limitation de débit par client et
+    par route (seaux à jetons), puis limite de concurrence globale pour
+    les routes coûteuses (rapports, listes complètes, export).
+    """
+
+    def __init__(self):
+        self.store = LocalBucketStore()
+        self.limiter = ConcurrencyLimiter()
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+
+    def configure(self, app):
+        self.store = LocalBucketStore(app.config.get('ADMISSION_MAX_BUCKETS', 100000))
+        if app.config.get('ADMISSION_BACKEND') == 'redis':
+            from redis import Redis
+            self.store = RedisBucketStore(
+                Redis.from_url(app.config['ADMISSION_REDIS_URL']),
+                fallback=self.store
+            )
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats['active'] = self.limiter.active
+        stats['waiting'] = self.limiter.waiting
+        return stats
+
+    @staticmethod
+    def client_id():
+        """
+        Client identifié par l'identité de son jeton JWT, vérifié (un en-tête
+        Authorization arbitraire ne crée pas de nouveau seau), ou à défaut
+        par son adresse IP
+        """
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            identity = None
+        if identity is not None:
+            return f"user:{identity}"
+        return f"ip:{request.remote_addr or 'unknown'}"
+
+    @staticmethod
+    def _reject(message, retry_after):
+        response = jsonify({'error': message})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+        return response
+
+    def before_request(self):
+        config = current_app.config
+        if not config.get('ADMISSION_ENABLED', True):
+            return None
+
+        endpoint = request.endpoint or ''
+        limits = config.get('ADMISSION_ROUTE_RATES', {}).get(endpoint) or config.get('ADMISSION_DEFAULT_RATE')
+        if limits:
+            allowed, retry_after = self.store.consume(
+                f"{self.client_id()}:{endpoint}",
+                limits['rate'],
+                limits['burst']
+            )
+            if not allowed:
+                self._count('rejected_rate_limit')
+                return self._reject('Trop de requêtes, réessayez plus tard', retry_after)
+
+        if endpoint in config.get('ADMISSION_EXPENSIVE_ENDPOINTS', []):
+            outcome = self.limiter.acquire(
+                config.get('ADMISSION_MAX_CONCURRENT', 4),
+                config.get('ADMISSION_MAX_QUEUE', 16),
+                config.get('ADMISSION_QUEUE_TIMEOUT_SECONDS', 2)
+            )
+            if outcome in ('rejected', 'timeout'):
+                self._count('rejected_concurrency' if outcome == 'rejected' else 'rejected_timeout')
+                return self._reject('Serveur occupé, réessayez plus tard', config.get('ADMISSION_RETRY_AFTER_SECONDS', 1))
+            self._count(outcome)
+            g.admission_slot = True
+            return None
+
+        self._count('admitted')
+        return None
+
+    def teardown_request(self, exc):
+        if g.pop('admission_slot', False):
+            self.limiter.release()
+
+
+admission_controller = AdmissionController()
+
+
+def init_admission(app, blueprint):
+    """
+    Brancher le contrôle d'admission sur les routes d'un blueprint, pour
+    cette application uniquement
+    """
+    admission_controller.configure(app)
+    app.before_request_funcs.setdefault(blueprint.name, []).append(admission_controller.before_request)
+    app.teardown_request_funcs.setdefault(blueprint.name, []).append(admission_controller.teardown_request)
@@ -2,11 +2,25 @@ from flask import Flask
 from flask_cors import CORS
 from models import db, MaintenanceRecord, Car, Admin
 from routes import car_routes
+import db_routing
+from logging_config import configure_logging
+from compression import init_compression
+from admission import init_admission
+from services.export_service import ExportService
+from services.archive_service import ArchiveService
+from services.idempotency_service import IdempotencyService
+from services.fleet_service import FleetService
+from services.search_service import car_search_index
 from flask_jwt_extended import JWTManager
 from flask_mail import Mail, Message
 from apscheduler.schedulers.background import BackgroundScheduler
 from datetime import datetime, timedelta
 import pytz
+import sys
+import logging
+import click
+
+logger = logging.getLogger(__name__)
 
 def send_maintenance_emails(app, mail):
     """
@@ -27,7 +41,7 @@ def send_maintenance_emails(app, mail):
             
             # Si aucun enregistrement de maintenance pour aujourd'hui, ne rien faire
             if not maintenance_records:
-                print("Aucune maintenance prévue pour aujourd'hui.")
+                logger.info("Aucune maintenance prévue pour aujourd'hui.")
                 return
             
             # Préparer le contenu de l'email
@@ -62,10 +76,45 @@ def send_maintenance_emails(app, mail):
             
             # Envoi de l'email
             mail.send(msg)
-            print(f"Email de maintenance envoyé avec succès le {datetime.now()}")
+            logger.info("Email de maintenance envoyé", extra={'maintenances': len(maintenance_records), 'recipients': len(admin_emails)})
         
-        except Exception as e:
-            print(f"Erreur lors de l'envoi de l'email de maintenance: {str(e)}")
+        except Exception:
+            logger.exception("Erreur lors de l'envoi de l'email de maintenance")
+
+def archive_maintenance_records(app):
+    """
+    Déplacer les maintenances anciennes vers la table d'archive
+    """
+    with app.app_context():
+        try:
+            result = ArchiveService.archive_closed_records(
+                months=app.config['ARCHIVE_AFTER_MONTHS'],
+                batch_size=app.config['ARCHIVE_BATCH_SIZE']
+            )
+            logger.info("Archivage terminé", extra=result)
+        except Exception:
+            logger.exception("Erreur lors de l'archivage des maintenances")
+
+def purge_idempotency_keys(app):
+    """
+    Supprimer les clés d'idempotence expirées
+    """
+    with app.app_context():
+        try:
+            IdempotencyService.purge_expired()
+        except Exception:
+            logger.exception("Erreur lors de la purge des clés d'idempotence")
+
+def refresh_search_index(app):
+    """
+    Recharger l'index de recherche si d'autres processus ont modifié les voitures
+    """
+    with app.app_context():
+        try:
+            if car_search_index.refresh_if_changed():
+                logger.info("Index de recherche rechargé")
+        except Exception:
+            logger.exception("Erreur lors du rafraîchissement de l'index de recherche")
 
 def init_scheduler(app):
     scheduler = BackgroundScheduler()
@@ -80,9 +129,89 @@ def init_scheduler(app):
         args=[app, mail]
     )
     
+    # Archiver les cycles clos chaque nuit à 2h00
+    scheduler.add_job(
+        func=archive_maintenance_records,
+        trigger='cron',
+        hour=2,
+        minute=0,
+        args=[app]
+    )
+    
+    # Purger les clés d'idempotence expirées toutes les heures
+    scheduler.add_job(
+        func=purge_idempotency_keys,
+        trigger='interval',
+        hours=1,
+        args=[app]
+    )
+    
+    # Détecter les modifications des voitures faites par d'autres processus
+    scheduler.add_job(
+        func=refresh_search_index,
+        trigger='interval',
+        seconds=app.config.get('SEARCH_INDEX_CHECK_SECONDS', 10),
+        args=[app]
+    )
+    
     scheduler.start()
     return scheduler
 
+def init_commands(app):
+    """
+    Enregistrer les commandes CLI (flask --app app:create_app <commande>)
+    """
+    @app.cli.command('export-maintenance')
+    @click.option('--format', 'export_format', type=click.Choice(['csv', 'ndjson']), default='csv')
+    @click.option('--gzip', 'compress', is_flag=True, help='Compresser la sortie en gzip')
+    @click.option('--output', type=click.Path(dir_okay=False, writable=True), help='Fichier de sortie (stdout par défaut)')
+    @click.option('--start-date', type=click.DateTime(formats=['%Y-%m-%d']))
+    @click.option('--end-date', type=click.DateTime(formats=['%Y-%m-%d']))
+    @click.option('--brand')
+    @click.option('--type', 'maintenance_type')
+    @click.option('--batch-size', type=int, default=ExportService.DEFAULT_BATCH_SIZE)
+    @click.option('--exclude-archived', is_flag=True, help='Exclure les cycles archivés')
+    def export_maintenance(export_format, compress, output, start_date, end_date, brand, maintenance_type, batch_size, exclude_archived):
+        """Exporter l'historique des maintenances en flux"""
+        chunks = ExportService.stream_maintenance_history(
+            export_format=export_format,
+            compress=compress,
+            batch_size=batch_size,
+            start_date=start_date.date() if start_date else None,
+            end_date=end_date.date() if end_date else None,
+            brand=brand,
+            maintenance_type=maintenance_type,
+            include_archived=not exclude_archived
+        )
+
+        stream = open(output, 'wb') if output else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                stream.write(chunk)
+        finally:
+            if output:
+                stream.close()
+
+    @app.cli.command('archive-maintenance')
+    @click.option('--months', type=int, help="Ancienneté minimale du cycle clos (défaut: ARCHIVE_AFTER_MONTHS)")
+    @click.option('--batch-size', type=int, help='Enregistrements par transaction (défaut: ARCHIVE_BATCH_SIZE)')
+    @click.option('--max-batches', type=int, help='Nombre maximum de lots à traiter')
+    def archive_maintenance(months, batch_size, max_batches):
+        """Archiver les maintenances dont le cycle est clos"""
+        result = ArchiveService.archive_closed_records(
+            months=months if months is not None else app.config['ARCHIVE_AFTER_MONTHS'],
+            batch_size=batch_size or app.config['ARCHIVE_BATCH_SIZE'],
+            max_batches=max_batches
+        )
+        click.echo(f"{result['archived']} maintenances archivées en {result['batches']} lots (avant le {result['cutoff']})")
+
+    @app.cli.command('backfill-schedules')
+    @click.option('--chunk-size', type=int, default=FleetService.DEFAULT_CHUNK_SIZE, help='Voitures par transaction')
+    def backfill_schedules(chunk_size):
+        """Créer les maintenances manquantes de toute la flotte"""
+        result = FleetService.backfill_missing_schedules(chunk_size=chunk_size)
+        click.echo(f"{result['created']} maintenances créées pour {result['scanned_cars']} voitures parcourues")
+
 def create_app():
     app = Flask(__name__)
     app.config['JWT_SECRET_KEY'] = 'votre-clé-secrète'  # Changez ceci en production
@@ -98,7 +227,10 @@ def create_app():
     
     CORS(app)
     app.config.from_object('config.Config')
+    configure_logging(app)
     db.init_app(app)
+    db_routing.init_app(app)
+    init_compression(app)
 
     with app.app_context():
         db.create_all()
@@ -106,9 +238,13 @@ def create_app():
     # Initialiser Mail
     mail = Mail(app)
     
-    # Enregistrer les routes
+    # Enregistrer les routes (avec contrôle d'admission)
+    init_admission(app, car_routes)
     app.register_blueprint(car_routes, url_prefix='/api')
 
+    # Enregistrer les commandes CLI
+    init_commands(app)
+
     # Initialiser le scheduler
     scheduler = init_scheduler(app)
     
@@ -0,0 +1,115 @@
+"""
+Mode de service asyncio pour les routes en lecture seule (listes et rapports).
+
+Les mêmes chemins que le blueprint synchrone sont exposés sous /api, avec
+une AsyncSession SQLAlchemy (aiomysql en production, aiosqlite en local).
+Les écritures restent servies par l'application Flask (app.py).
+
+Lancement :
+    hypercorn "async_app:create_async_app()" --bind 0.0.0.0:5001
+"""
+from quart import Quart, Blueprint, current_app, jsonify, request
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from services.async_maintenance_service import AsyncMaintenanceService
+
+async_routes = Blueprint('async_routes', __name__)
+
+
+def _session():
+    return current_app.async_session()
+
+
+@async_routes.route('/maintenance/upcoming', methods=['GET'])
+async def get_upcoming_maintenances():
+    async with _session() as session:
+        upcoming_maintenances = await AsyncMaintenanceService.get_upcoming_maintenances(session, days_ahead=30)
+    return jsonify(upcoming_maintenances), 200
+
+
+@async_routes.route('/get-cars', methods=['GET'])
+async def get_all_cars():
+    async with _session() as session:
+        cars = await AsyncMaintenanceService.get_all_cars(session)
+    return jsonify(cars), 200
+
+
+@async_routes.route('/maintenance/completed', methods=['GET'])
+async def get_completed_maintenances():
+    car_id = request.args.get('car_id', type=int)
+
+    try:
+        async with _session() as session:
+            completed_maintenances = await AsyncMaintenanceService.get_completed_maintenances(session, car_id)
+        return jsonify(completed_maintenances), 200
+    except Exception as e:
+        return jsonify({'error': 'Erreur lors de la récupération des maintenances complétées'}), 500
+
+
+@async_routes.route('/reports/overdue', methods=['GET'])
+async def get_overdue_maintenances():
+    try:
+        async with _session() as session:
+            overdue = await AsyncMaintenanceService.get_overdue_maintenances(session)
+        return jsonify(overdue), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_routes.route('/reports/monthly-summary', methods=['GET'])
+async def get_monthly_summary():
+    year = request.args.get('year', type=int)
+    month = request.args.get('month', type=int)
+
+    if not year or not month:
+        return jsonify({'error': 'Les paramètres year et month sont requis'}), 400
+
+    try:
+        async with _session() as session:
+            summary = await AsyncMaintenanceService.get_monthly_summary(session, year, month)
+        return jsonify(summary), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_routes.route('/reports/brand-stats', methods=['GET'])
+async def get_brand_stats():
+    try:
+        async with _session() as session:
+            stats = await AsyncMaintenanceService.get_brand_maintenance_stats(session)
+        return jsonify(stats), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@async_routes.route('/reports/status-distribution', methods=['GET'])
+async def get_status_distribution():
+    try:
+        async with _session() as session:
+            distribution = await AsyncMaintenanceService.get_maintenance_status_distribution(session)
+        return jsonify(distribution), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def create_async_app(database_uri=None):
+    app = Quart(__name__)
+    app.config.from_object('config.Config')
+
+    engine = create_async_engine(
+        database_uri or app.config['ASYNC_DATABASE_URI'],
+        pool_size=app.config['ASYNC_POOL_SIZE'],
+        max_overflow=app.config['ASYNC_MAX_OVERFLOW']
+    )
+    app.async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+    @app.after_serving
+    async def dispose_engine():
+        await engine.dispose()
+
+    app.register_blueprint(async_routes, url_prefix='/api')
+    return app
+
+
+if __name__ == '__main__':
+    app = create_async_app()
+    app.run(port=5001)
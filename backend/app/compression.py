@@ -0,0 +1,148 @@
+import zlib
+from flask import request
+
+# Algorithmes optionnels : utilisés seulement si le module est installé
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class _GzipCompressor:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+COMPRESSORS = {'gzip': _GzipCompressor}
+if brotli is not None:
+    COMPRESSORS['br'] = _BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS['zstd'] = _ZstdCompressor
+
+
+def available_encodings(preferred):
+    """Algorithmes de la configuration réellement disponibles, dans l'ordre de préférence"""
+    return [encoding for encoding in preferred if encoding in COMPRESSORS]
+
+
+def choose_encoding(accept_encodings, preferred):
+    """
+    Choisir l'encodage d'après Accept-Encoding : la plus haute qualité (q)
+    l'emporte, à qualité égale l'ordre de préférence de la configuration.
+
+    Returns:
+        str ou None si aucun encodage acceptable
+    """
+    best = None
+    best_quality = 0
+    for encoding in available_encodings(preferred):
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding, level):
+    """Compresser un corps complet"""
+    compressor = COMPRESSORS[encoding](level)
+    return compressor.compress(data) + compressor.finish()
+
+
+def compress_stream(chunks, encoding, level):
+    """
+    Compresser un flux morceau par morceau ; chaque morceau est vidé
+    (flush) pour que le client reçoive les données au fil de l'eau
+    """
+    compressor = COMPRESSORS[encoding](level)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.compress(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def init_compression(app):
+    """
+    Compresser les réponses (gzip, et br / zstd si disponibles) selon
+    l'en-tête Accept-Encoding du client
+    """
+    @app.after_request
+    def compress_response(response):
+        config = app.config
+        if not config.get('COMPRESS_ENABLED', True):
+            return response
+        if (
+            request.method == 'HEAD'
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in config.get('COMPRESS_MIMETYPES', ['application/json'])
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings, config.get('COMPRESS_ALGORITHMS', ['gzip']))
+        if encoding is None:
+            return response
+        level = config.get('COMPRESS_LEVELS', {}).get(encoding, 6)
+
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding, level)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < config.get('COMPRESS_MIN_SIZE', 1024):
+                return response
+            response.set_data(compress(data, encoding, level))
+
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -9,16 +9,114 @@ class Config:
     
     NOTIFICATION_DAYS_AHEAD = 30
 
+    # Index de recherche en mémoire : vérification en tâche de fond (nombre
+    # de voitures et dernier updated_at) des modifications faites par
+    # d'autres processus, rechargement si la table a changé
+    SEARCH_INDEX_CHECK_SECONDS = 10
+
+    # Durée de vie d'une page d'historique en cache (invalidation locale au
+    # processus : borne le délai de prise en compte des autres processus)
+    HISTORY_CACHE_TTL_SECONDS = 5
+
+    # Archivage des maintenances dont le cycle est clos depuis plus de N mois
+    ARCHIVE_AFTER_MONTHS = 12
+    ARCHIVE_BATCH_SIZE = 1000
+
+    # Clés d'idempotence (en-tête Idempotency-Key) sur les créations
+    IDEMPOTENCY_TTL_SECONDS = 24 * 3600
+    IDEMPOTENCY_LOCAL_CACHE_SIZE = 10000
+    # Bail d'une requête en cours : au-delà, une nouvelle tentative reprend la clé
+    IDEMPOTENCY_LOCK_SECONDS = 10
+
     # Configuration de la base de données MySQL
     USERNAME = 'root'
     PASSWORD = ''
     HOST = 'localhost'  # Ou l'adresse IP de votre serveur MySQL
     DATABASE = 'car_rental_db'
 
-    # URI de la base de données MySQL
-    SQLALCHEMY_DATABASE_URI = f'mysql+pymysql://{USERNAME}:{PASSWORD}@{HOST}/{DATABASE}'
+    # URI de la base de données MySQL (primaire)
+    SQLALCHEMY_DATABASE_URI = os.getenv(
+        'PRIMARY_DATABASE_URI',
+        f'mysql+pymysql://{USERNAME}:{PASSWORD}@{HOST}/{DATABASE}'
+    )
+
+    # Mode asyncio (async_app.py) pour les routes en lecture seule
+    ASYNC_DATABASE_URI = os.getenv(
+        'ASYNC_DATABASE_URI',
+        f'mysql+aiomysql://{USERNAME}:{PASSWORD}@{HOST}/{DATABASE}'
+    )
+    ASYNC_POOL_SIZE = 20
+    ASYNC_MAX_OVERFLOW = 10
+
+    # Réplicas en lecture seule, séparés par des virgules
+    # ex: REPLICA_DATABASE_URIS=sqlite:////tmp/replica1.db,sqlite:////tmp/replica2.db
+    REPLICA_DATABASE_URIS = [uri for uri in os.getenv('REPLICA_DATABASE_URIS', '').split(',') if uri]
+    SQLALCHEMY_BINDS = {f'replica_{i}': uri for i, uri in enumerate(REPLICA_DATABASE_URIS, 1)}
+    SQLALCHEMY_REPLICA_BINDS = list(SQLALCHEMY_BINDS)
+    REPLICA_HEALTH_CHECK_SECONDS = 10
+    # Après une écriture, le client lit sur le primaire pendant ce délai
+    REPLICA_STICKY_SECONDS = 5
+
+
+
+    # Regroupement des lectures identiques simultanées (@coalesce)
+    SINGLE_FLIGHT_ENABLED = True
+
+    # Snapshot en colonnes (numpy) pour les rapports ; rafraîchi depuis
+    # updated_at, rechargé entièrement périodiquement
+    FLEET_SNAPSHOT_ENABLED = os.getenv('FLEET_SNAPSHOT_ENABLED', 'false').lower() == 'true'
+    FLEET_SNAPSHOT_REFRESH_SECONDS = 30
+    FLEET_SNAPSHOT_FULL_RELOAD_SECONDS = 3600
+    # Recouvrement de la relecture incrémentale (transactions longues
+    # validées après le rafraîchissement précédent)
+    FLEET_SNAPSHOT_WATERMARK_MARGIN_SECONDS = 60
+
+    # Contrôle d'admission (admission.py) : débit par client et par route,
+    # concurrence globale des routes coûteuses
+    ADMISSION_ENABLED = True
+    ADMISSION_BACKEND = os.getenv('ADMISSION_BACKEND', 'local')  # 'local' ou 'redis'
+    ADMISSION_REDIS_URL = os.getenv('ADMISSION_REDIS_URL', 'redis://localhost:6379/1')
+    ADMISSION_DEFAULT_RATE = {'rate': 10, 'burst': 20}
+    ADMISSION_ROUTE_RATES = {
+        'car_routes.get_all_maintenances': {'rate': 0.5, 'burst': 3},
+        'car_routes.export_maintenances': {'rate': 0.1, 'burst': 2},
+        'car_routes.get_brand_stats': {'rate': 1, 'burst': 5},
+        'car_routes.get_status_distribution': {'rate': 1, 'burst': 5},
+        'car_routes.get_monthly_summary': {'rate': 1, 'burst': 5},
+        'car_routes.get_overdue_maintenances': {'rate': 1, 'burst': 5}
+    }
+    ADMISSION_EXPENSIVE_ENDPOINTS = [
+        'car_routes.get_all_maintenances',
+        'car_routes.get_all_cars',
+        'car_routes.export_maintenances',
+        'car_routes.get_overdue_maintenances',
+        'car_routes.get_monthly_summary',
+        'car_routes.get_brand_stats',
+        'car_routes.get_status_distribution'
+    ]
+    # A garder sous la taille du pool de connexions SQLAlchemy
+    ADMISSION_MAX_CONCURRENT = 4
+    ADMISSION_MAX_QUEUE = 16
+    ADMISSION_QUEUE_TIMEOUT_SECONDS = 2
+    ADMISSION_RETRY_AFTER_SECONDS = 1
 
+    # Journalisation structurée (logging_config.py)
+    LOG_LEVEL = 'INFO'
+    LOG_LEVELS = {
+        'sqlalchemy.engine': 'WARNING',
+        'apscheduler': 'WARNING'
+    }
+    # Fraction des messages DEBUG conservés
+    LOG_DEBUG_SAMPLE_RATE = 0.01
+    LOG_QUEUE_SIZE = 10000
 
+    # Compression des réponses (compression.py) ; br et zstd nécessitent
+    # les paquets optionnels brotli et zstandard
+    COMPRESS_ENABLED = True
+    COMPRESS_ALGORITHMS = ['zstd', 'br', 'gzip']
+    COMPRESS_LEVELS = {'gzip': 6, 'br': 4, 'zstd': 3}
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_MIMETYPES = ['application/json', 'text/csv', 'application/x-ndjson', 'text/plain']
 
     SMTP_SERVER = 'smtp.gmail.com'
     SMTP_PORT = 587
@@ -0,0 +1,163 @@
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from flask import current_app, g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+
+# Positionné par @read_only le temps de l'appel d'une méthode de lecture
+_read_only = ContextVar('db_read_only', default=False)
+
+STICKY_COOKIE = 'db_primary_until'
+
+
+def read_only(func):
+    """
+    Marquer une méthode de service comme lecture seule : ses requêtes
+    peuvent être envoyées vers un réplica (voir RoutingSession).
+
+    A placer sous @classmethod / @staticmethod.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    """
+    Choix d'un réplica en tourniquet parmi les binds déclarés dans
+    SQLALCHEMY_REPLICA_BINDS, en ignorant ceux dont le dernier test de
+    santé (SELECT 1, mis en cache REPLICA_HEALTH_CHECK_SECONDS) a échoué.
+    """
+
+    def __init__(self):
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        # bind -> (en bonne santé, horodatage du test)
+        self._health = {}
+
+    def _is_healthy(self, bind_key, engine, interval):
+        now = time.monotonic()
+        with self._lock:
+            status = self._health.get(bind_key)
+        if status is not None and now - status[1] < interval:
+            return status[0]
+
+        try:
+            with engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+            healthy = True
+        except Exception:
+            healthy = False
+
+        with self._lock:
+            self._health[bind_key] = (healthy, now)
+        return healthy
+
+    def choose(self, engines):
+        """
+        Returns:
+            Engine du réplica choisi, ou None s'il faut utiliser le primaire
+        """
+        bind_keys = [key for key in current_app.config.get('SQLALCHEMY_REPLICA_BINDS', []) if key in engines]
+        if not bind_keys:
+            return None
+
+        interval = current_app.config.get('REPLICA_HEALTH_CHECK_SECONDS', 10)
+        start = next(self._counter)
+        for offset in range(len(bind_keys)):
+            bind_key = bind_keys[(start + offset) % len(bind_keys)]
+            engine = engines[bind_key]
+            if self._is_healthy(bind_key, engine, interval):
+                return engine
+        return None
+
+    def reset(self):
+        with self._lock:
+            self._health.clear()
+
+
+replica_router = ReplicaRouter()
+
+
+def primary_required(session):
+    """
+    Lecture sur le primaire si la session a des écritures en attente, ou si
+    le client vient d'écrire (read-your-writes)
+    """
+    if session.new or session.dirty or session.deleted or session.info.get('wrote'):
+        return True
+    if not has_app_context():
+        return False
+
+    now = time.time()
+    if g.get('db_primary_until', 0) > now:
+        return True
+    if has_request_context():
+        try:
+            return float(request.cookies.get(STICKY_COOKIE, 0)) > now
+        except ValueError:
+            return False
+    return False
+
+
+class RoutingSession(Session):
+    """
+    Session qui envoie les lectures des méthodes @read_only vers un réplica
+    et tout le reste (écritures, flush, lectures hors @read_only) vers le
+    primaire.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _read_only.get() and not self._flushing and not primary_required(self):
+            engine = replica_router.choose(self._db.engines)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_flush(session, flush_context):
+    session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _mark_write_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _stick_to_primary(session):
+    if session.info.pop('wrote', False) and has_app_context():
+        g.db_primary_until = time.time() + current_app.config.get('REPLICA_STICKY_SECONDS', 5)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _clear_write_mark(session):
+    session.info.pop('wrote', None)
+
+
+def init_app(app):
+    """
+    Propager la fenêtre read-your-writes au client via un cookie, pour que
+    ses requêtes suivantes lisent aussi sur le primaire
+    """
+    @app.after_request
+    def set_sticky_cookie(response):
+        primary_until = g.get('db_primary_until')
+        if primary_until:
+            response.set_cookie(
+                STICKY_COOKIE,
+                str(primary_until),
+                max_age=app.config.get('REPLICA_STICKY_SECONDS', 5),
+                httponly=True
+            )
+        return response
@@ -0,0 +1,166 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, request
+
+# Identifiant de corrélation de la requête en cours ('-' hors requête)
+request_id_var = ContextVar('request_id', default='-')
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+# Attributs standards d'un LogRecord : tout le reste vient de extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id'}
+
+_listener = None
+_queue_handler = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Ajouter l'identifiant de corrélation à chaque enregistrement"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Ne conserver qu'une fraction des messages DEBUG (événements à fort volume)"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par message, avec les champs passés via extra={...}"""
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-')
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Handler qui ne bloque jamais le worker : le message est mis en file et
+    écrit par le thread du QueueListener. Si la file est pleine, le message
+    est abandonné et compté.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Fusionner msg/args et figer la trace d'exception avant de changer
+        # de thread ; les champs extra restent sur l'enregistrement
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logging_stats():
+    """
+    Messages abandonnés (file pleine) et messages en attente d'écriture
+    """
+    if _queue_handler is None:
+        return {'dropped': 0, 'queued': 0}
+    return {'dropped': _queue_handler.dropped, 'queued': _queue_handler.queue.qsize()}
+
+
+def configure_logging(app):
+    """
+    Installer la journalisation structurée : file en mémoire + thread
+    d'écriture sur stderr (stdout reste libre pour les sorties des commandes
+    CLI), niveaux par logger, échantillonnage des DEBUG et
+    identifiant de corrélation par requête (en-tête X-Request-ID).
+    """
+    global _listener, _queue_handler
+    _stop_listener()
+
+    log_queue = queue.Queue(maxsize=app.config.get('LOG_QUEUE_SIZE', 10000))
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter())
+
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(DebugSamplingFilter(app.config.get('LOG_DEBUG_SAMPLE_RATE', 1.0)))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, NonBlockingQueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    _queue_handler = queue_handler
+    root.setLevel(app.config.get('LOG_LEVEL', 'INFO'))
+
+    for name, level in app.config.get('LOG_LEVELS', {}).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+
+    @app.before_request
+    def bind_request_id():
+        request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+        g.request_id = request_id
+        g.request_id_token = request_id_var.set(request_id)
+
+    @app.after_request
+    def add_request_id_header(response):
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+
+    @app.teardown_request
+    def unbind_request_id(exc):
+        token = g.pop('request_id_token', None)
+        if token is not None:
+            request_id_var.reset(token)
+
+    return queue_handler
@@ -1,8 +1,9 @@
 from flask_sqlalchemy import SQLAlchemy
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 from datetime import datetime, timedelta
+from db_routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class Car(db.Model):
     __tablename__ = 'cars'
@@ -15,24 +16,73 @@ class Car(db.Model):
     mileage = db.Column(db.Integer, default=0)
     status = db.Column(db.Enum('available', 'maintenance', 'rented'), default='available')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Indexé : MAX(updated_at) pour la détection des changements (index de recherche)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relation avec les enregistrements de maintenance
-    maintenance_records = db.relationship('MaintenanceRecord', backref='car', lazy=True)
+    # (suppression en cascade faite par la base : ON DELETE CASCADE)
+    maintenance_records = db.relationship(
+        'MaintenanceRecord',
+        backref='car',
+        lazy=True,
+        cascade='all',
+        passive_deletes=True
+    )
 
 class MaintenanceRecord(db.Model):
     __tablename__ = 'maintenance_records'
+    __table_args__ = (
+        # Historique paginé par voiture (tri next_due_date DESC, id DESC)
+        db.Index('ix_maintenance_car_due', 'car_id', 'next_due_date', 'id'),
+        # Ne jamais réattribuer l'id d'un enregistrement archivé : AUTOINCREMENT
+        # sous SQLite ; sous MySQL, le compteur n'est persisté qu'à partir de 8.0
+        {'sqlite_autoincrement': True}
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    car_id = db.Column(db.Integer, db.ForeignKey('cars.id'), nullable=False)
+    car_id = db.Column(db.Integer, db.ForeignKey('cars.id', ondelete='CASCADE'), nullable=False)
     type = db.Column(db.Enum('oil_change', 'technical_inspection', 'insurance'), nullable=False)
     last_done_date = db.Column(db.Date, nullable=False)
-    next_due_date = db.Column(db.Date, nullable=False)
+    next_due_date = db.Column(db.Date, nullable=False, index=True)
     notes = db.Column(db.Text)
     status = db.Column(db.Enum('pending', 'completed', 'overdue'), default='pending')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class MaintenanceRecordArchive(db.Model):
+    __tablename__ = 'maintenance_records_archive'
+    __table_args__ = (
+        db.Index('ix_maintenance_archive_car_due', 'car_id', 'next_due_date', 'source_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    # Identifiant d'origine dans maintenance_records
+    source_id = db.Column(db.Integer, nullable=False, index=True)
+    car_id = db.Column(db.Integer, nullable=False)
+    type = db.Column(db.Enum('oil_change', 'technical_inspection', 'insurance'), nullable=False)
+    last_done_date = db.Column(db.Date, nullable=False)
+    next_due_date = db.Column(db.Date, nullable=False)
+    notes = db.Column(db.Text)
+    status = db.Column(db.Enum('pending', 'completed', 'overdue'), default='pending')
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class IdempotencyKey(db.Model):
+    __tablename__ = 'idempotency_keys'
+
+    # '<endpoint>:<Idempotency-Key>'
+    key = db.Column(db.String(255), primary_key=True)
+    request_fingerprint = db.Column(db.String(64), nullable=False)
+    # NULL tant que la requête d'origine est en cours de traitement
+    status_code = db.Column(db.Integer)
+    response_body = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    # Bail de la réservation : passé ce délai sans réponse, la requête
+    # d'origine est considérée comme interrompue et la clé peut être reprise
+    locked_until = db.Column(db.DateTime)
+
 class Admin(db.Model):
     __tablename__ = 'admins'
 
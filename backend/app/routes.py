@@ -1,17 +1,28 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from models import db, Car, MaintenanceRecord, Admin
 from services.maintenance_service import MaintenanceService
+from services.export_service import ExportService
+from services.search_service import car_search_index
+from services.idempotency_service import idempotent
+from services.fleet_service import FleetService
+from services.single_flight import single_flight
+from admission import admission_controller
+import logging_config
 from datetime import datetime  # Ajoutez cette ligne en haut du fichier
 from werkzeug.security import check_password_hash
 from flask_jwt_extended import create_access_token
 from flask_mail import Mail, Message
 from datetime import datetime, timedelta
 import os
+import logging
 from redis import Redis
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+logger = logging.getLogger(__name__)
+
 car_routes = Blueprint('car_routes', __name__)
 BLOCKLIST = set()
 @car_routes.route('/cars', methods=['POST'])
+@idempotent
 def add_car():
     data = request.json
 
@@ -28,11 +39,50 @@ def add_car():
         mileage=data.get('mileage', 0)
     )
     db.session.add(new_car)
+
+    # Planning initial de maintenance optionnel, dans la même transaction
+    if data.get('generate_schedule'):
+        db.session.flush()
+        MaintenanceService.generate_initial_schedules([new_car.id])
+
     db.session.commit()
+    car_search_index.upsert(new_car)
 
     return jsonify({'message': 'Car added successfully', 'car_id': new_car.id}), 201
 
 
+@car_routes.route('/cars/bulk', methods=['POST'])
+@idempotent
+def add_cars_bulk():
+    """
+    Ajouter plusieurs voitures en une seule transaction.
+
+    JSON Body:
+        {
+            "cars": [{"plate_number": ..., "brand": ..., "model": ..., "year": ...}, ...],
+            "generate_schedule": true,          # optionnel
+            "last_done_date": "2024-11-09"      # optionnel, format YYYY-MM-DD
+        }
+    """
+    data = request.json or {}
+
+    try:
+        last_done_date = data.get('last_done_date')
+        if last_done_date:
+            last_done_date = datetime.strptime(last_done_date, '%Y-%m-%d').date()
+
+        cars = FleetService.add_cars(
+            data.get('cars', []),
+            generate_schedule=data.get('generate_schedule', False),
+            last_done_date=last_done_date
+        )
+        return jsonify({'message': 'Cars added successfully', 'car_ids': [car.id for car in cars]}), 201
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur interne du serveur'}), 500
+
+
 @car_routes.route('/cars/<int:car_id>', methods=['PUT'])
 def update_car(car_id):
     data = request.json
@@ -48,24 +98,103 @@ def update_car(car_id):
     car.mileage = data.get('mileage', car.mileage)
 
     db.session.commit()
+    car_search_index.upsert(car)
     return jsonify({'message': 'Car updated successfully'}), 200
 
 @car_routes.route('/cars/<int:car_id>', methods=['DELETE'])
 def delete_car(car_id):
     try:
-        car = Car.query.get(car_id)
+        result = FleetService.purge_cars([car_id])
         
-        if not car:
+        if not result['deleted_cars']:
             return jsonify({'message': 'Car not found'}), 404
             
-        db.session.delete(car)
-        db.session.commit()
         return jsonify({'message': 'Car deleted successfully'}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': f'Error deleting car: {str(e)}'}), 500
 
+
+@car_routes.route('/cars/purge', methods=['POST'])
+def purge_cars():
+    """
+    Supprimer plusieurs voitures et toutes leurs maintenances.
+
+    JSON Body:
+        {
+            "car_ids": [1, 2, 3],
+            "chunk_size": 500   # optionnel, voitures par transaction
+        }
+    """
+    data = request.json or {}
+    car_ids = data.get('car_ids')
+    chunk_size = data.get('chunk_size', FleetService.DEFAULT_CHUNK_SIZE)
+
+    def is_int(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    if not isinstance(car_ids, list) or not car_ids or not all(is_int(car_id) for car_id in car_ids):
+        return jsonify({'error': "Le paramètre car_ids (liste non vide d'entiers) est requis"}), 400
+    if not is_int(chunk_size) or chunk_size <= 0:
+        return jsonify({'error': 'Le paramètre chunk_size doit être un entier positif'}), 400
+
+    try:
+        result = FleetService.purge_cars(car_ids, chunk_size=chunk_size)
+        return jsonify(result), 200
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+    except Exception as e:
+        return jsonify({'error': f'Error purging cars: {str(e)}'}), 500
+
+@car_routes.route('/cars/search', methods=['GET'])
+def search_cars():
+    """
+    Recherche par préfixe (typeahead) sur l'immatriculation, la marque et le modèle.
+
+    Query params:
+        q: préfixe recherché
+        limit: nombre maximum de résultats (défaut: 10, max: 100)
+        field: plate_number | brand | model (optionnel)
+    """
+    query = request.args.get('q', '')
+    limit = min(request.args.get('limit', 10, type=int), 100)
+    field = request.args.get('field')
+
+    try:
+        results = car_search_index.search(query, limit=limit, field=field)
+        return jsonify(results), 200
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+
+@car_routes.route('/cars/<int:car_id>/maintenance', methods=['GET'])
+def get_car_maintenance_history(car_id):
+    """
+    Historique paginé des maintenances d'une voiture.
+
+    Query params:
+        limit: taille de la page (défaut: 50, max: 200)
+        cursor: curseur 'next_cursor' renvoyé par la page précédente
+        include_archived: true pour inclure les maintenances archivées
+    """
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    include_archived = request.args.get('include_archived', 'false').lower() in ('1', 'true', 'yes')
+
+    try:
+        page = MaintenanceService.get_maintenance_history_page(
+            car_id,
+            limit=limit,
+            cursor=cursor,
+            include_archived=include_archived
+        )
+        return jsonify(page), 200
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @car_routes.route('/maintenance', methods=['POST'])
+@idempotent
 def create_maintenance():
     data = request.json
     try:
@@ -189,6 +318,48 @@ def get_all_maintenances():
         return jsonify({'error': 'Erreur lors de la récupération des maintenances'}), 500
 
 
+@car_routes.route('/maintenance/export', methods=['GET'])
+def export_maintenances():
+    """
+    Exporter l'historique complet des maintenances en flux (CSV ou NDJSON).
+
+    Query params (optionnels):
+        format: csv | ndjson (défaut: csv)
+        gzip: true pour compresser le flux
+        start_date, end_date: bornes sur last_done_date (YYYY-MM-DD)
+        brand: marque de voiture
+        type: type de maintenance
+        include_archived: false pour exclure les cycles archivés (défaut: true)
+    """
+    export_format = request.args.get('format', 'csv')
+    compress = request.args.get('gzip', 'false').lower() in ('1', 'true', 'yes')
+
+    try:
+        filters = {
+            'brand': request.args.get('brand'),
+            'maintenance_type': request.args.get('type'),
+            'include_archived': request.args.get('include_archived', 'true').lower() not in ('0', 'false', 'no')
+        }
+        for key in ('start_date', 'end_date'):
+            value = request.args.get(key)
+            filters[key] = datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+        chunks = ExportService.stream_maintenance_history(
+            export_format=export_format,
+            compress=compress,
+            **filters
+        )
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+
+    metadata = ExportService.get_export_metadata(export_format, compress)
+    return Response(
+        stream_with_context(chunks),
+        mimetype=metadata['mimetype'],
+        headers={'Content-Disposition': f"attachment; filename={metadata['filename']}"}
+    )
+
+
 @car_routes.route('/maintenance/notifications', methods=['GET'])
 def send_maintenance_notifications():
     try:
@@ -227,8 +398,8 @@ def get_completed_maintenances():
     try:
         completed_maintenances = MaintenanceService.get_completed_maintenances(car_id)
         return jsonify(completed_maintenances), 200
-    except Exception as e:
-        print("Erreur Backend:", str(e))  # Ajoute cette ligne pour voir l'erreur exacte
+    except Exception:
+        logger.exception("Erreur lors de la récupération des maintenances complétées")
         return jsonify({'error': 'Erreur lors de la récupération des maintenances complétées'}), 500
 
 @car_routes.route('/reports/overdue', methods=['GET'])
@@ -273,6 +444,34 @@ def get_status_distribution():
         return jsonify({'error': str(e)}), 500
 
 
+
+@car_routes.route('/metrics/single-flight', methods=['GET'])
+def get_single_flight_stats():
+    """
+    Compteurs du regroupement des requêtes identiques, par méthode :
+    exécutions réelles, appels regroupés et attentes expirées.
+    """
+    return jsonify(single_flight.get_stats()), 200
+
+
+@car_routes.route('/metrics/admission', methods=['GET'])
+def get_admission_stats():
+    """
+    Compteurs du contrôle d'admission : requêtes admises, admises après
+    attente, rejetées (débit, concurrence, délai) et en cours.
+    """
+    return jsonify(admission_controller.get_stats()), 200
+
+
+@car_routes.route('/metrics/logging', methods=['GET'])
+def get_logging_stats():
+    """
+    Compteurs de la journalisation : messages abandonnés faute de place
+    dans la file, et messages en attente d'écriture.
+    """
+    return jsonify(logging_config.get_logging_stats()), 200
+
+
 redis_client = Redis(host='localhost', port=6379, db=0)
 auth_service = MaintenanceService.initialize(redis_client).get_instance()
 
@@ -281,15 +480,13 @@ auth_service = MaintenanceService.initialize(redis_client).get_instance()
 def logout():
     try:
         jti = get_jwt()['jti']
-        print(f"Tentative de déconnexion - JTI du token: {jti}")
         
         # Ajouter le token à la liste noire
         BLOCKLIST.add(jti)
-        print(f"Token ajouté à la liste noire avec succès")
-        print(f"État actuel de la BLOCKLIST: {BLOCKLIST}")
+        logger.info("Token ajouté à la liste noire", extra={'jti': jti, 'blocklist_size': len(BLOCKLIST)})
         
         return jsonify(message="Successfully logged out"), 200
         
-    except Exception as e:
-        print(f"Erreur lors de la déconnexion: {str(e)}")
+    except Exception:
+        logger.exception("Erreur lors de la déconnexion")
         return jsonify(message="Logout failed"), 500
@@ -0,0 +1,123 @@
+# backend/services/archive_service.py
+from datetime import date, datetime, timedelta
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.orm import aliased
+from models import db, MaintenanceRecord, MaintenanceRecordArchive
+from services.history_cache import maintenance_history_cache
+from typing import Dict, Optional
+
+class ArchiveService:
+    DEFAULT_ARCHIVE_AFTER_MONTHS = 12
+    DEFAULT_BATCH_SIZE = 1000
+
+    # Colonnes copiées telles quelles de la table chaude vers l'archive
+    # (l'id d'origine est conservé dans source_id)
+    ARCHIVED_COLUMNS = [
+        'car_id',
+        'type',
+        'last_done_date',
+        'next_due_date',
+        'notes',
+        'status',
+        'created_at',
+        'updated_at'
+    ]
+
+    @classmethod
+    def get_archive_cutoff(cls, months: int) -> date:
+        """
+        Date limite : les cycles remplacés avant cette date sont archivés
+        """
+        return datetime.now().date() - timedelta(days=months * 30)
+
+    @classmethod
+    def _archive_batch(cls, ids) -> None:
+        """
+        Déplacer un lot d'enregistrements vers l'archive dans une seule transaction
+        """
+        archived_at = datetime.utcnow()
+        source = select(
+            MaintenanceRecord.id,
+            *[getattr(MaintenanceRecord, column) for column in cls.ARCHIVED_COLUMNS],
+            literal(archived_at)
+        ).where(MaintenanceRecord.id.in_(ids))
+
+        db.session.execute(
+            insert(MaintenanceRecordArchive).from_select(
+                ['source_id'] + cls.ARCHIVED_COLUMNS + ['archived_at'],
+                source
+            )
+        )
+        db.session.execute(
+            delete(MaintenanceRecord)
+            .where(MaintenanceRecord.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+
+    @classmethod
+    def archive_closed_records(
+        cls,
+        months: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None
+    ) -> Dict:
+        """
+        Archiver les maintenances dont le cycle (next_due_date) est clos
+        depuis plus de N mois
+
+        Un cycle n'est clos que s'il a été remplacé par un enregistrement plus
+        récent de la même voiture et du même type : la dernière échéance
+        d'un type reste dans la table chaude, même en retard.
+
+        Chaque lot est copié puis supprimé dans sa propre transaction : une
+        exécution interrompue peut simplement être relancée, elle reprend
+        là où elle s'était arrêtée.
+
+        Args:
+            months (int, optional): Ancienneté minimale du cycle clos
+            batch_size (int, optional): Nombre d'enregistrements par transaction
+            max_batches (int, optional): Limiter le nombre de lots traités
+
+        Returns:
+            Dict: Nombre d'enregistrements archivés, de lots et date limite
+        """
+        months = months if months is not None else cls.DEFAULT_ARCHIVE_AFTER_MONTHS
+        batch_size = batch_size or cls.DEFAULT_BATCH_SIZE
+        if months < 0 or batch_size <= 0:
+            raise ValueError("Paramètres d'archivage invalides")
+
+        cutoff = cls.get_archive_cutoff(months)
+        newer = aliased(MaintenanceRecord)
+        superseded = select(newer.id).where(
+            newer.car_id == MaintenanceRecord.car_id,
+            newer.type == MaintenanceRecord.type,
+            newer.next_due_date > MaintenanceRecord.next_due_date
+        ).exists()
+        archived = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            rows = db.session.query(MaintenanceRecord.id, MaintenanceRecord.car_id).filter(
+                MaintenanceRecord.next_due_date < cutoff,
+                superseded
+            ).order_by(MaintenanceRecord.id).limit(batch_size).all()
+            if not rows:
+                break
+            ids = [row.id for row in rows]
+
+            try:
+                cls._archive_batch(ids)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                raise e
+
+            maintenance_history_cache.invalidate(*{row.car_id for row in rows})
+            archived += len(ids)
+            batches += 1
+
+        return {
+            'archived': archived,
+            'batches': batches,
+            'cutoff': cutoff.isoformat()
+        }
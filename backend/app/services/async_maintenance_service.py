@@ -0,0 +1,159 @@
+# backend/services/async_maintenance_service.py
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Car, MaintenanceRecord
+from typing import Dict, List, Optional
+
+class AsyncMaintenanceService:
+    """
+    Version asynchrone (AsyncSession) des méthodes de lecture de
+    MaintenanceService, pour le mode de service asyncio (async_app.py).
+
+    Les résultats ont exactement la même forme que ceux de la version
+    synchrone ; les modèles sont partagés.
+    """
+
+    @staticmethod
+    def _serialize(maintenance: MaintenanceRecord, car: Car) -> Dict:
+        return {
+            'maintenance_id': maintenance.id,
+            'car_id': car.id,
+            'plate_number': car.plate_number,
+            'brand': car.brand,
+            'model': car.model,
+            'maintenance_type': maintenance.type,
+            'last_done_date': maintenance.last_done_date,
+            'next_due_date': maintenance.next_due_date
+        }
+
+    @classmethod
+    async def get_upcoming_maintenances(cls, session: AsyncSession, days_ahead: int = 30) -> List[Dict]:
+        """
+        Récupérer les maintenances à venir dans les prochains jours
+        """
+        today = datetime.now().date()
+        upcoming_date = today + timedelta(days=days_ahead)
+
+        result = await session.execute(
+            select(MaintenanceRecord, Car).join(Car).where(
+                MaintenanceRecord.next_due_date.between(today, upcoming_date)
+            )
+        )
+        return [cls._serialize(maintenance, car) for maintenance, car in result.all()]
+
+    @classmethod
+    async def get_all_cars(cls, session: AsyncSession) -> List[Dict]:
+        """
+        Récupérer toutes les voitures existantes dans la base de données
+        """
+        result = await session.execute(select(Car))
+
+        return [
+            {
+                'id': car.id,
+                'plate_number': car.plate_number,
+                'brand': car.brand,
+                'model': car.model,
+                'year': car.year,
+                'mileage': car.mileage,
+                'status': car.status,
+                'created_at': car.created_at,
+                'updated_at': car.updated_at
+            }
+            for car in result.scalars()
+        ]
+
+    @classmethod
+    async def get_completed_maintenances(cls, session: AsyncSession, car_id: Optional[int] = None) -> List[Dict]:
+        """
+        Récupérer les maintenances dont la date d'échéance est passée
+        """
+        today = datetime.today().date()
+
+        query = select(MaintenanceRecord, Car).join(Car).where(MaintenanceRecord.next_due_date < today)
+        if car_id is not None:
+            query = query.where(MaintenanceRecord.car_id == car_id)
+
+        result = await session.execute(query)
+        return [
+            {**cls._serialize(maintenance, car), 'status': maintenance.status}
+            for maintenance, car in result.all()
+        ]
+
+    @classmethod
+    async def get_overdue_maintenances(cls, session: AsyncSession) -> List[Dict]:
+        """
+        Récupérer toutes les maintenances en retard
+        """
+        today = datetime.today().date()
+
+        result = await session.execute(
+            select(MaintenanceRecord, Car).join(Car).where(MaintenanceRecord.next_due_date < today)
+        )
+        return [
+            {
+                **cls._serialize(maintenance, car),
+                'days_overdue': (today - maintenance.next_due_date).days
+            }
+            for maintenance, car in result.all()
+        ]
+
+    @classmethod
+    async def get_monthly_summary(cls, session: AsyncSession, year: int, month: int) -> Dict:
+        """
+        Récupérer un résumé mensuel des maintenances
+        """
+        start_date = datetime(year, month, 1)
+        end_date = start_date + timedelta(days=31)
+
+        completed = await session.scalar(
+            select(func.count(MaintenanceRecord.id)).where(
+                MaintenanceRecord.last_done_date.between(start_date, end_date)
+            )
+        )
+        upcoming = await session.scalar(
+            select(func.count(MaintenanceRecord.id)).where(
+                MaintenanceRecord.next_due_date.between(start_date, end_date)
+            )
+        )
+
+        return {
+            'month': f"{year}-{month:02d}",
+            'completed_maintenances': completed,
+            'upcoming_maintenances': upcoming
+        }
+
+    @classmethod
+    async def get_brand_maintenance_stats(cls, session: AsyncSession) -> Dict:
+        """
+        Statistiques de maintenance par marque de voiture
+        """
+        result = await session.execute(
+            select(
+                Car.brand,
+                func.count(MaintenanceRecord.id),
+                func.avg(func.datediff(MaintenanceRecord.next_due_date, MaintenanceRecord.last_done_date))
+            ).join(MaintenanceRecord).group_by(Car.brand)
+        )
+
+        return {
+            brand: {
+                'total_maintenances': count,
+                'average_cycle_days': round((avg_days or 0), 2)
+            }
+            for brand, count, avg_days in result.all()
+        }
+
+    @classmethod
+    async def get_maintenance_status_distribution(cls, session: AsyncSession) -> Dict:
+        """
+        Statistiques de répartition des statuts de maintenance
+        """
+        result = await session.execute(
+            select(
+                MaintenanceRecord.status,
+                func.count(MaintenanceRecord.id)
+            ).group_by(MaintenanceRecord.status)
+        )
+        return dict(result.all())
@@ -0,0 +1,197 @@
+# backend/services/export_service.py
+import csv
+import io
+import json
+import zlib
+from datetime import date
+from sqlalchemy import select, union_all
+from typing import Dict, Iterator, List, Optional
+from models import db, Car, MaintenanceRecord, MaintenanceRecordArchive
+
+class ExportService:
+    EXPORT_FORMATS = ('csv', 'ndjson')
+
+    EXPORT_COLUMNS = [
+        'maintenance_id',
+        'car_id',
+        'plate_number',
+        'brand',
+        'model',
+        'maintenance_type',
+        'last_done_date',
+        'next_due_date',
+        'status'
+    ]
+
+    # Nombre de lignes lues par aller-retour avec le curseur serveur
+    DEFAULT_BATCH_SIZE = 1000
+
+    @classmethod
+    def _build_query(
+        cls,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        brand: Optional[str] = None,
+        maintenance_type: Optional[str] = None,
+        include_archived: bool = True
+    ):
+        """
+        Construire la requête d'export (colonnes uniquement, sans entités ORM)
+
+        Les colonnes sont sélectionnées une par une pour que la session ne
+        garde aucun objet dans l'identity map pendant le parcours. Les cycles
+        archivés sont inclus par défaut (UNION ALL sur l'archive, avec l'id
+        d'origine) : l'export reste l'historique complet.
+        """
+        def columns(model, id_column):
+            query = select(
+                id_column.label('maintenance_id'),
+                model.car_id,
+                Car.plate_number,
+                Car.brand,
+                Car.model,
+                model.type,
+                model.last_done_date,
+                model.next_due_date,
+                model.status
+            ).join(Car, Car.id == model.car_id)
+
+            if start_date is not None:
+                query = query.where(model.last_done_date >= start_date)
+            if end_date is not None:
+                query = query.where(model.last_done_date <= end_date)
+            if brand:
+                query = query.where(Car.brand == brand)
+            if maintenance_type:
+                query = query.where(model.type == maintenance_type)
+            return query
+
+        hot = columns(MaintenanceRecord, MaintenanceRecord.id)
+        if not include_archived:
+            return hot.order_by(MaintenanceRecord.id)
+
+        history = union_all(
+            hot,
+            columns(MaintenanceRecordArchive, MaintenanceRecordArchive.source_id)
+        ).subquery()
+        return select(history).order_by(history.c.maintenance_id)
+
+    @classmethod
+    def _iter_rows(cls, batch_size: int, **filters) -> Iterator[List[Dict]]:
+        """
+        Parcourir les enregistrements par lots via un curseur côté serveur
+
+        Yields:
+            List[Dict]: Lot de lignes prêtes à être sérialisées
+        """
+        rows = db.session.execute(
+            cls._build_query(**filters).execution_options(yield_per=batch_size)
+        )
+
+        batch = []
+        for row in rows:
+            batch.append(dict(zip(cls.EXPORT_COLUMNS, row)))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _serialize_value(value):
+        if isinstance(value, date):
+            return value.isoformat()
+        return value
+
+    @classmethod
+    def _encode_csv(cls, batches: Iterator[List[Dict]]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=cls.EXPORT_COLUMNS)
+        writer.writeheader()
+
+        for batch in batches:
+            writer.writerows(
+                {key: cls._serialize_value(value) for key, value in row.items()}
+                for row in batch
+            )
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate(0)
+
+        # En-tête seul si aucun enregistrement ne correspond aux filtres
+        remaining = buffer.getvalue()
+        if remaining:
+            yield remaining.encode('utf-8')
+
+    @classmethod
+    def _encode_ndjson(cls, batches: Iterator[List[Dict]]) -> Iterator[bytes]:
+        for batch in batches:
+            yield ''.join(
+                json.dumps(row, default=cls._serialize_value) + '\n'
+                for row in batch
+            ).encode('utf-8')
+
+    @staticmethod
+    def _gzip(chunks: Iterator[bytes], level: int = 6) -> Iterator[bytes]:
+        """Compresser le flux au fil de l'eau (format gzip, wbits=31)"""
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    @classmethod
+    def stream_maintenance_history(
+        cls,
+        export_format: str = 'csv',
+        compress: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        **filters
+    ) -> Iterator[bytes]:
+        """
+        Exporter l'historique des maintenances (jointure avec les voitures)
+        sous forme de flux d'octets, avec une mémoire constante
+
+        Args:
+            export_format (str): 'csv' ou 'ndjson'
+            compress (bool): Compresser le flux en gzip
+            batch_size (int): Taille des lots lus depuis la base
+            **filters: start_date, end_date, brand, maintenance_type,
+                include_archived (True par défaut)
+
+        Returns:
+            Iterator[bytes]: Morceaux du fichier d'export
+        """
+        if export_format not in cls.EXPORT_FORMATS:
+            raise ValueError(f"Format d'export invalide: {export_format}")
+        if batch_size <= 0:
+            raise ValueError("La taille de lot doit être positive")
+
+        batches = cls._iter_rows(batch_size, **filters)
+        if export_format == 'csv':
+            chunks = cls._encode_csv(batches)
+        else:
+            chunks = cls._encode_ndjson(batches)
+
+        if compress:
+            chunks = cls._gzip(chunks)
+        return chunks
+
+    @classmethod
+    def get_export_metadata(cls, export_format: str, compress: bool) -> Dict:
+        """
+        Type MIME et nom de fichier correspondant au format demandé
+        """
+        if compress:
+            mimetype = 'application/gzip'
+        elif export_format == 'csv':
+            mimetype = 'text/csv'
+        else:
+            mimetype = 'application/x-ndjson'
+
+        filename = f"maintenance_history.{export_format}"
+        if compress:
+            filename += '.gz'
+
+        return {'mimetype': mimetype, 'filename': filename}
@@ -0,0 +1,218 @@
+# backend/services/fleet_service.py
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import delete, insert, literal, select, true, union_all
+from models import db, Car, MaintenanceRecord, MaintenanceRecordArchive
+from services.maintenance_service import MaintenanceService
+from services.history_cache import maintenance_history_cache
+from services.search_service import car_search_index
+from typing import Dict, List, Optional
+
+class FleetService:
+    CAR_REQUIRED_FIELDS = ('plate_number', 'brand', 'model', 'year')
+
+    DEFAULT_CHUNK_SIZE = 1000
+
+    @classmethod
+    def add_cars(
+        cls,
+        cars_data: List[Dict],
+        generate_schedule: bool = False,
+        last_done_date: Optional[datetime] = None
+    ) -> List[Car]:
+        """
+        Ajouter plusieurs voitures (et éventuellement leur planning initial
+        de maintenance) dans une seule transaction
+
+        Args:
+            cars_data (List[Dict]): Voitures à créer
+            generate_schedule (bool): Créer le planning initial de maintenance
+            last_done_date (datetime, optional): Date de dernière maintenance du planning
+
+        Returns:
+            List[Car]: Voitures créées
+        """
+        if not cars_data:
+            raise ValueError("Aucune voiture à ajouter")
+
+        for index, data in enumerate(cars_data):
+            missing = [field for field in cls.CAR_REQUIRED_FIELDS if field not in data]
+            if missing:
+                raise ValueError(f"Voiture #{index}: champs manquants {', '.join(missing)}")
+
+        plates = [data['plate_number'] for data in cars_data]
+        duplicates = [plate for plate, count in Counter(plates).items() if count > 1]
+        if duplicates:
+            raise ValueError(f"Immatriculations en double dans la requête: {', '.join(sorted(duplicates))}")
+
+        existing = [
+            plate for (plate,) in db.session.query(Car.plate_number).filter(Car.plate_number.in_(plates))
+        ]
+        if existing:
+            raise ValueError(f"Immatriculations déjà existantes: {', '.join(sorted(existing))}")
+
+        cars = [
+            Car(
+                plate_number=data['plate_number'],
+                brand=data['brand'],
+                model=data['model'],
+                year=data['year'],
+                mileage=data.get('mileage', 0)
+            )
+            for data in cars_data
+        ]
+
+        try:
+            db.session.add_all(cars)
+            db.session.flush()
+            if generate_schedule:
+                MaintenanceService.generate_initial_schedules([car.id for car in cars], last_done_date)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+        for car in cars:
+            car_search_index.upsert(car)
+        return cars
+
+    @classmethod
+    def _missing_schedule_query(cls, first_car_id: int, last_car_id: int):
+        """
+        Couples (voiture, type) sans aucun enregistrement de maintenance,
+        ni dans la table chaude ni dans l'archive, calculés en SQL (produit
+        voitures x types, anti-jointures)
+        """
+        types = union_all(*[
+            select(literal(maintenance_type).label('type'))
+            for maintenance_type in MaintenanceService.MAINTENANCE_INTERVALS
+        ]).subquery()
+
+        def has_record(model):
+            return select(model.id).where(
+                model.car_id == Car.id,
+                model.type == types.c.type
+            ).exists()
+
+        return select(Car.id, types.c.type).select_from(Car).join(types, true()).where(
+            Car.id.between(first_car_id, last_car_id),
+            ~has_record(MaintenanceRecord),
+            ~has_record(MaintenanceRecordArchive)
+        )
+
+    @classmethod
+    def backfill_missing_schedules(
+        cls,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        last_done_date: Optional[datetime] = None
+    ) -> Dict:
+        """
+        Créer, pour toute la flotte, les maintenances manquantes (une par type
+        et par voiture), par lots de voitures commités séparément
+
+        Args:
+            chunk_size (int): Nombre de voitures par lot
+            last_done_date (datetime, optional): Date de dernière maintenance des créations
+
+        Returns:
+            Dict: Nombre de voitures parcourues et d'enregistrements créés
+        """
+        if chunk_size <= 0:
+            raise ValueError("La taille de lot doit être positive")
+
+        last_car_id = 0
+        scanned = 0
+        created = 0
+
+        while True:
+            car_ids = [
+                car_id for (car_id,) in db.session.query(Car.id).filter(
+                    Car.id > last_car_id
+                ).order_by(Car.id).limit(chunk_size)
+            ]
+            if not car_ids:
+                break
+
+            missing = {
+                (car_id, maintenance_type)
+                for car_id, maintenance_type in db.session.execute(
+                    cls._missing_schedule_query(car_ids[0], car_ids[-1])
+                )
+            }
+            rows = [
+                row for row in MaintenanceService.build_initial_schedule(
+                    sorted({car_id for car_id, _ in missing}),
+                    last_done_date
+                )
+                if (row['car_id'], row['type']) in missing
+            ]
+
+            if rows:
+                try:
+                    db.session.execute(insert(MaintenanceRecord), rows)
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    raise e
+                maintenance_history_cache.invalidate(*{row['car_id'] for row in rows})
+
+            last_car_id = car_ids[-1]
+            scanned += len(car_ids)
+            created += len(rows)
+
+        return {'scanned_cars': scanned, 'created': created}
+
+    @classmethod
+    def purge_cars(cls, car_ids: List[int], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+        """
+        Supprimer des voitures avec toutes leurs maintenances (actives et
+        archivées), par requêtes ensemblistes et par lots commités séparément
+
+        Les maintenances sont supprimées explicitement avant les voitures :
+        la purge ne dépend pas de la présence de ON DELETE CASCADE sur une
+        base existante (create_all ne modifie pas les tables déjà créées).
+
+        Args:
+            car_ids (List[int]): Identifiants des voitures à supprimer
+            chunk_size (int): Nombre de voitures par transaction
+
+        Returns:
+            Dict: Nombre de voitures et de maintenances supprimées
+        """
+        if chunk_size <= 0:
+            raise ValueError("La taille de lot doit être positive")
+
+        car_ids = sorted(set(car_ids))
+        deleted_cars = 0
+        deleted_records = 0
+
+        for start in range(0, len(car_ids), chunk_size):
+            chunk = car_ids[start:start + chunk_size]
+            try:
+                db.session.execute(
+                    delete(MaintenanceRecordArchive)
+                    .where(MaintenanceRecordArchive.car_id.in_(chunk))
+                    .execution_options(synchronize_session=False)
+                )
+                records = db.session.execute(
+                    delete(MaintenanceRecord)
+                    .where(MaintenanceRecord.car_id.in_(chunk))
+                    .execution_options(synchronize_session=False)
+                )
+                cars = db.session.execute(
+                    delete(Car)
+                    .where(Car.id.in_(chunk))
+                    .execution_options(synchronize_session=False)
+                )
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                raise e
+
+            for car_id in chunk:
+                car_search_index.remove(car_id)
+            maintenance_history_cache.invalidate(*chunk)
+            deleted_cars += cars.rowcount
+            deleted_records += records.rowcount
+
+        return {'deleted_cars': deleted_cars, 'deleted_maintenances': deleted_records}
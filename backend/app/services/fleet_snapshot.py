@@ -0,0 +1,279 @@
+# backend/services/fleet_snapshot.py
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func
+from models import db, Car, MaintenanceRecord
+from typing import Dict, List, Optional, Tuple
+
+# numpy est optionnel : sans lui, les rapports interrogent la base
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class _Dictionary:
+    """Encodage dictionnaire d'une colonne texte (codes stables, ajout seulement)"""
+
+    def __init__(self):
+        self.values: List = []
+        self._codes: Dict = {}
+
+    def encode(self, value) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+
+class _Table:
+    """Colonnes numpy d'une table, et position de chaque id dans les colonnes"""
+
+    def __init__(self, columns: Dict, positions: Dict[int, int]):
+        self.columns = columns
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+
+class _State:
+    def __init__(self, cars: _Table, records: _Table):
+        self.cars = cars
+        self.records = records
+
+        # Jointure maintenance -> marque de la voiture (-1 si voiture absente)
+        record_car_ids = records.columns['car_id']
+        self.record_brands = np.full(len(record_car_ids), -1, dtype=np.int32)
+
+        car_ids = cars.columns['id']
+        if len(car_ids):
+            order = np.argsort(car_ids, kind='stable')
+            sorted_ids = car_ids[order]
+            index = np.searchsorted(sorted_ids, record_car_ids).clip(max=len(sorted_ids) - 1)
+            found = sorted_ids[index] == record_car_ids
+            self.record_brands[found] = cars.columns['brand'][order[index[found]]]
+
+
+class FleetSnapshot:
+    """
+    Copie en mémoire, en colonnes numpy, des tables cars et
+    maintenance_records pour répondre aux rapports (group by / filtres)
+    par opérations vectorisées, sans interroger la base.
+
+    Les colonnes texte sont encodées par dictionnaire (marque, type, statut)
+    et les dates stockées en numéro de jour (date.toordinal()). Le snapshot
+    est rafraîchi de façon incrémentale à partir de updated_at, relu avec
+    une marge de recouvrement pour ne pas manquer les transactions validées
+    après la lecture précédente (updated_at antérieur au filigrane) ; les
+    suppressions, invisibles pour updated_at, sont détectées par comparaison
+    du nombre de lignes et provoquent un rechargement complet.
+    """
+
+    CAR_COLUMNS = (('id', 'int64'), ('brand', 'int32'), ('status', 'int8'))
+    RECORD_COLUMNS = (
+        ('id', 'int64'),
+        ('car_id', 'int64'),
+        ('type', 'int8'),
+        ('status', 'int8'),
+        ('last_done_day', 'int32'),
+        ('next_due_day', 'int32')
+    )
+
+    FETCH_BATCH_SIZE = 10000
+    DEFAULT_WATERMARK_MARGIN_SECONDS = 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: Optional[_State] = None
+        self._brands = _Dictionary()
+        self._car_statuses = _Dictionary()
+        self._types = _Dictionary()
+        self._record_statuses = _Dictionary()
+        self._watermarks = {}
+        self._refreshed_at = 0.0
+        self._loaded_at = 0.0
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return np is not None and current_app.config.get('FLEET_SNAPSHOT_ENABLED', False)
+
+    def _encode_car(self, row) -> tuple:
+        return (row.id, self._brands.encode(row.brand), self._car_statuses.encode(row.status))
+
+    def _encode_record(self, row) -> tuple:
+        return (
+            row.id,
+            row.car_id,
+            self._types.encode(row.type),
+            self._record_statuses.encode(row.status),
+            row.last_done_date.toordinal(),
+            row.next_due_date.toordinal()
+        )
+
+    def _fetch(self, model, columns, encode, since: Optional[datetime]) -> Tuple[List[tuple], Optional[datetime]]:
+        """
+        Returns:
+            (List[tuple], datetime): lignes encodées et nouveau filigrane
+        """
+        query = db.session.query(*[getattr(model, column) for column in columns], model.updated_at)
+        if since is not None:
+            margin = current_app.config.get(
+                'FLEET_SNAPSHOT_WATERMARK_MARGIN_SECONDS',
+                self.DEFAULT_WATERMARK_MARGIN_SECONDS
+            )
+            query = query.filter(model.updated_at >= since - timedelta(seconds=margin))
+
+        rows = []
+        watermark = since
+        for row in query.yield_per(self.FETCH_BATCH_SIZE):
+            rows.append(encode(row))
+            if row.updated_at is not None and (watermark is None or row.updated_at > watermark):
+                watermark = row.updated_at
+        return rows, watermark
+
+    @staticmethod
+    def _merge(table: Optional[_Table], rows: List[tuple], schema) -> _Table:
+        """
+        Appliquer des lignes (insertions ou mises à jour) sur une copie des
+        colonnes : les lecteurs de l'ancien état ne voient jamais d'état partiel
+        """
+        names = [name for name, _ in schema]
+        if table is None:
+            columns = {name: np.empty(0, dtype=dtype) for name, dtype in schema}
+            positions = {}
+        elif not rows:
+            return table
+        else:
+            columns = {name: array.copy() for name, array in table.columns.items()}
+            positions = dict(table.positions)
+
+        appended = []
+        for row in rows:
+            position = positions.get(row[0])
+            if position is None:
+                positions[row[0]] = len(positions)
+                appended.append(row)
+            else:
+                for name, value in zip(names, row):
+                    columns[name][position] = value
+
+        if appended:
+            for index, (name, dtype) in enumerate(schema):
+                values = np.fromiter((row[index] for row in appended), dtype=dtype, count=len(appended))
+                columns[name] = np.concatenate([columns[name], values])
+
+        return _Table(columns, positions)
+
+    def refresh(self, full: bool = False) -> _State:
+        """
+        Recharger le snapshot (complet ou incrémental depuis updated_at)
+        """
+        with self._lock:
+            return self._refresh(full)
+
+    def _refresh(self, full: bool) -> _State:
+        now = time.monotonic()
+        full_reload = current_app.config.get('FLEET_SNAPSHOT_FULL_RELOAD_SECONDS', 3600)
+        full = full or self._state is None or now - self._loaded_at >= full_reload
+
+        previous = None if full else self._state
+        car_rows, car_watermark = self._fetch(
+            Car,
+            ('id', 'brand', 'status'),
+            self._encode_car,
+            None if full else self._watermarks.get('cars')
+        )
+        record_rows, record_watermark = self._fetch(
+            MaintenanceRecord,
+            ('id', 'car_id', 'type', 'status', 'last_done_date', 'next_due_date'),
+            self._encode_record,
+            None if full else self._watermarks.get('records')
+        )
+        cars = self._merge(previous.cars if previous else None, car_rows, self.CAR_COLUMNS)
+        records = self._merge(previous.records if previous else None, record_rows, self.RECORD_COLUMNS)
+
+        if not full:
+            car_count = db.session.query(func.count(Car.id)).scalar()
+            record_count = db.session.query(func.count(MaintenanceRecord.id)).scalar()
+            if car_count != len(cars) or record_count != len(records):
+                # Des lignes ont été supprimées : rechargement complet
+                return self._refresh(full=True)
+
+        if previous is None or cars is not previous.cars or records is not previous.records:
+            self._state = _State(cars, records)
+        # Filigranes enregistrés seulement une fois le nouvel état en place :
+        # un échec plus tôt laisse les lignes à relire au prochain rafraîchissement
+        self._watermarks = {'cars': car_watermark, 'records': record_watermark}
+        if full:
+            self._loaded_at = now
+        self._refreshed_at = now
+        return self._state
+
+    def get_state(self) -> _State:
+        """Snapshot courant, rafraîchi s'il est plus ancien que FLEET_SNAPSHOT_REFRESH_SECONDS"""
+        interval = current_app.config.get('FLEET_SNAPSHOT_REFRESH_SECONDS', 30)
+        state = self._state
+        if state is None or time.monotonic() - self._refreshed_at >= interval:
+            state = self.refresh()
+        return state
+
+    def get_brand_maintenance_stats(self) -> Dict:
+        """
+        Statistiques de maintenance par marque (même forme que
+        MaintenanceService.get_brand_maintenance_stats)
+        """
+        state = self.get_state()
+        columns = state.records.columns
+        joined = state.record_brands >= 0
+        brands = state.record_brands[joined]
+        cycle_days = (columns['next_due_day'] - columns['last_done_day'])[joined]
+
+        size = len(self._brands.values)
+        counts = np.bincount(brands, minlength=size)
+        totals = np.bincount(brands, weights=cycle_days, minlength=size)
+
+        return {
+            brand: {
+                'total_maintenances': int(counts[code]),
+                'average_cycle_days': round(float(totals[code] / counts[code]), 2)
+            }
+            for code, brand in enumerate(self._brands.values)
+            if code < len(counts) and counts[code]
+        }
+
+    def get_maintenance_status_distribution(self) -> Dict:
+        """
+        Répartition des statuts de maintenance
+        """
+        state = self.get_state()
+        return self._count_by(state.records.columns['status'], self._record_statuses)
+
+    def get_maintenance_summary(self, days_ahead: int = 30) -> Dict:
+        """
+        Rapport récapitulatif (même forme que ReportingService.get_maintenance_summary)
+        """
+        state = self.get_state()
+        limit = (datetime.now().date() + timedelta(days=days_ahead)).toordinal()
+
+        return {
+            'total_cars': len(state.cars),
+            'car_status': self._count_by(state.cars.columns['status'], self._car_statuses),
+            'upcoming_maintenances': int(np.count_nonzero(state.records.columns['next_due_day'] <= limit))
+        }
+
+    @staticmethod
+    def _count_by(codes, dictionary: _Dictionary) -> Dict:
+        counts = np.bincount(codes.astype(np.int64), minlength=len(dictionary.values))
+        return {
+            value: int(counts[code])
+            for code, value in enumerate(dictionary.values)
+            if code < len(counts) and counts[code]
+        }
+
+
+fleet_snapshot = FleetSnapshot()
@@ -0,0 +1,64 @@
+# backend/services/history_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+class CarHistoryCache:
+    """
+    Cache en mémoire des pages d'historique de maintenance, regroupées par voiture.
+
+    Toutes les pages d'une voiture sont stockées sous une même entrée, ce qui
+    permet d'invalider uniquement la voiture dont les maintenances ont changé.
+    Le nombre de voitures en cache est borné (éviction LRU).
+
+    L'invalidation ne concerne que ce processus : chaque page expire aussi
+    après un court délai, qui borne la durée pendant laquelle une
+    modification faite ailleurs (autre worker, commande CLI) reste invisible.
+    """
+
+    DEFAULT_MAX_CARS = 10000
+    DEFAULT_TTL_SECONDS = 5
+
+    def __init__(self, max_cars: int = DEFAULT_MAX_CARS, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_cars = max_cars
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[int, dict]' = OrderedDict()
+
+    def get(self, car_id: int, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            pages = self._entries.get(car_id)
+            if pages is None:
+                return None
+            self._entries.move_to_end(car_id)
+            page = pages.get(key)
+            if page is None:
+                return None
+            expires_at, value = page
+            if time.monotonic() >= expires_at:
+                del pages[key]
+                return None
+            return value
+
+    def set(self, car_id: int, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl_seconds = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        with self._lock:
+            pages = self._entries.setdefault(car_id, {})
+            pages[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(car_id)
+            while len(self._entries) > self.max_cars:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *car_ids: int) -> None:
+        """Supprimer toutes les pages en cache des voitures données"""
+        with self._lock:
+            for car_id in car_ids:
+                self._entries.pop(car_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+maintenance_history_cache = CarHistoryCache()
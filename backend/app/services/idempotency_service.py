@@ -0,0 +1,230 @@
+# backend/services/idempotency_service.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Optional, Tuple
+from flask import current_app, jsonify, make_response, request
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from models import db, IdempotencyKey
+
+class IdempotencyService:
+    HEADER = 'Idempotency-Key'
+    MAX_KEY_LENGTH = 200
+
+    DEFAULT_TTL_SECONDS = 24 * 3600
+    DEFAULT_LOCAL_CACHE_SIZE = 10000
+    DEFAULT_LOCK_SECONDS = 10
+
+    # Réponses déjà enregistrées : clé -> (expiration, empreinte, statut, corps)
+    _local_cache: 'OrderedDict[str, tuple]' = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def _config(cls, name: str, default):
+        return current_app.config.get(name, default)
+
+    @classmethod
+    def _cache_get(cls, key: str) -> Optional[tuple]:
+        with cls._lock:
+            entry = cls._local_cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del cls._local_cache[key]
+                return None
+            cls._local_cache.move_to_end(key)
+            return entry
+
+    @classmethod
+    def _cache_set(cls, key: str, expires_at: float, fingerprint: str, status_code: int, body: str):
+        max_size = cls._config('IDEMPOTENCY_LOCAL_CACHE_SIZE', cls.DEFAULT_LOCAL_CACHE_SIZE)
+        with cls._lock:
+            cls._local_cache[key] = (expires_at, fingerprint, status_code, body)
+            cls._local_cache.move_to_end(key)
+            while len(cls._local_cache) > max_size:
+                cls._local_cache.popitem(last=False)
+
+    @staticmethod
+    def _fingerprint() -> str:
+        """Empreinte de la requête, pour refuser une clé réutilisée avec un autre corps"""
+        digest = hashlib.sha256()
+        digest.update(request.method.encode())
+        digest.update(request.path.encode())
+        digest.update(request.get_data())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _replay(status_code: int, body: str):
+        response = current_app.response_class(body, status=status_code, mimetype='application/json')
+        response.headers['Idempotent-Replayed'] = 'true'
+        return response
+
+    @classmethod
+    def _reserve(
+        cls,
+        key: str,
+        fingerprint: str,
+        expires_at: datetime,
+        locked_until: datetime
+    ) -> Tuple[bool, Optional[IdempotencyKey]]:
+        """
+        Réserver la clé (INSERT sur la clé primaire), ou reprendre une
+        réservation dont le bail a expiré sans réponse enregistrée
+
+        Returns:
+            (bool, IdempotencyKey): clé réservée, sinon l'enregistrement
+            existant (None si la clé n'a pu être ni réservée ni lue)
+        """
+        for _ in range(2):
+            try:
+                db.session.execute(insert(IdempotencyKey).values(
+                    key=key,
+                    request_fingerprint=fingerprint,
+                    created_at=datetime.utcnow(),
+                    expires_at=expires_at,
+                    locked_until=locked_until
+                ))
+                db.session.commit()
+                return True, None
+            except IntegrityError:
+                db.session.rollback()
+
+            existing = db.session.execute(
+                select(IdempotencyKey).where(IdempotencyKey.key == key)
+            ).scalar_one_or_none()
+            if existing is None:
+                continue
+
+            now = datetime.utcnow()
+            if existing.expires_at < now:
+                # Clé expirée mais pas encore purgée : la libérer et réessayer
+                db.session.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+                db.session.commit()
+                continue
+
+            if existing.status_code is None and (existing.locked_until is None or existing.locked_until < now):
+                # Requête d'origine interrompue : reprendre la clé (un seul gagnant)
+                result = db.session.execute(
+                    update(IdempotencyKey)
+                    .where(
+                        IdempotencyKey.key == key,
+                        IdempotencyKey.status_code.is_(None),
+                        or_(IdempotencyKey.locked_until.is_(None), IdempotencyKey.locked_until < now)
+                    )
+                    .values(
+                        request_fingerprint=fingerprint,
+                        created_at=now,
+                        expires_at=expires_at,
+                        locked_until=locked_until
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                db.session.commit()
+                if result.rowcount == 1:
+                    return True, None
+                continue
+
+            return False, existing
+
+        return False, None
+
+    @classmethod
+    def _release(cls, key: str):
+        """Libérer une réservation pour permettre au client de réessayer"""
+        db.session.rollback()
+        db.session.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+        db.session.commit()
+
+    @classmethod
+    def _store(cls, key: str, status_code: int, body: str):
+        db.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key)
+            .values(status_code=status_code, response_body=body)
+        )
+        db.session.commit()
+
+    @classmethod
+    def idempotent(cls, view):
+        """
+        Décorateur de route : une requête rejouée avec le même en-tête
+        Idempotency-Key renvoie la réponse enregistrée, sans réexécuter la vue
+        ni interroger les tables métier.
+        """
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            client_key = request.headers.get(cls.HEADER)
+            if not client_key:
+                return view(*args, **kwargs)
+            if len(client_key) > cls.MAX_KEY_LENGTH:
+                return jsonify({'error': f'{cls.HEADER} trop long'}), 400
+
+            key = f"{request.endpoint}:{client_key}"
+            fingerprint = cls._fingerprint()
+
+            cached = cls._cache_get(key)
+            if cached is not None:
+                _, cached_fingerprint, status_code, body = cached
+                if cached_fingerprint != fingerprint:
+                    return jsonify({'error': f'{cls.HEADER} déjà utilisée pour une autre requête'}), 422
+                return cls._replay(status_code, body)
+
+            ttl = cls._config('IDEMPOTENCY_TTL_SECONDS', cls.DEFAULT_TTL_SECONDS)
+            lock = cls._config('IDEMPOTENCY_LOCK_SECONDS', cls.DEFAULT_LOCK_SECONDS)
+            now = datetime.utcnow()
+
+            reserved, existing = cls._reserve(
+                key,
+                fingerprint,
+                now + timedelta(seconds=ttl),
+                now + timedelta(seconds=lock)
+            )
+            if not reserved:
+                if existing is None:
+                    return jsonify({'error': 'Clé en cours de réservation, réessayez'}), 409
+                if existing.request_fingerprint != fingerprint:
+                    return jsonify({'error': f'{cls.HEADER} déjà utilisée pour une autre requête'}), 422
+                if existing.status_code is None:
+                    return jsonify({'error': 'Requête identique en cours de traitement'}), 409
+                remaining = (existing.expires_at - datetime.utcnow()).total_seconds()
+                cls._cache_set(key, time.time() + remaining, fingerprint, existing.status_code, existing.response_body)
+                return cls._replay(existing.status_code, existing.response_body)
+
+            try:
+                response = make_response(view(*args, **kwargs))
+            except Exception:
+                cls._release(key)
+                raise
+
+            # Les erreurs serveur ne sont pas mémorisées : le client peut réessayer
+            if response.status_code >= 500:
+                cls._release(key)
+                return response
+
+            body = response.get_data(as_text=True)
+            cls._store(key, response.status_code, body)
+            cls._cache_set(key, time.time() + ttl, fingerprint, response.status_code, body)
+            return response
+
+        return wrapper
+
+    @classmethod
+    def purge_expired(cls) -> int:
+        """
+        Supprimer les clés expirées de la base
+
+        Returns:
+            int: Nombre de clés supprimées
+        """
+        result = db.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at < datetime.utcnow())
+        )
+        db.session.commit()
+        return result.rowcount
+
+
+idempotent = IdempotencyService.idempotent
@@ -1,10 +1,18 @@
 # backend/services/maintenance_service.py
+import logging
 from datetime import datetime, timedelta
-from sqlalchemy import func
-from models import db, Car, MaintenanceRecord
+from flask import current_app
+from sqlalchemy import and_, func, insert, literal, or_, select, union_all
+from models import db, Car, MaintenanceRecord, MaintenanceRecordArchive
+from services.history_cache import maintenance_history_cache
+from db_routing import primary_required, read_only
+from services.single_flight import coalesce
+from services.fleet_snapshot import fleet_snapshot
 from typing import List, Dict, Optional
 from flask_jwt_extended import get_jti, get_jwt
 
+logger = logging.getLogger(__name__)
+
 class MaintenanceService:
     MAINTENANCE_INTERVALS = {
         'oil_change': 6,        # tous les 6 mois
@@ -64,27 +72,196 @@ class MaintenanceService:
         try:
             db.session.add(record)
             db.session.commit()
+            maintenance_history_cache.invalidate(car_id)
             return record
         except Exception as e:
             db.session.rollback()
             raise e
 
     @classmethod
-    def get_maintenance_history(cls, car_id: int) -> List[MaintenanceRecord]:
+    def build_initial_schedule(cls, car_ids: List[int], last_done_date: Optional[datetime] = None) -> List[Dict]:
+        """
+        Construire les lignes du planning initial (un enregistrement par type
+        de maintenance et par voiture)
+        
+        Args:
+            car_ids (List[int]): Identifiants des voitures
+            last_done_date (datetime, optional): Date de dernière maintenance
+        
+        Returns:
+            List[Dict]: Lignes prêtes pour un INSERT groupé
+        """
+        today = last_done_date or datetime.now().date()
+        return [
+            {
+                'car_id': car_id,
+                'type': maintenance_type,
+                'last_done_date': today,
+                'next_due_date': today + timedelta(days=interval_months * 30)
+            }
+            for car_id in car_ids
+            for maintenance_type, interval_months in cls.MAINTENANCE_INTERVALS.items()
+        ]
+
+    @classmethod
+    def generate_initial_schedules(cls, car_ids: List[int], last_done_date: Optional[datetime] = None) -> int:
+        """
+        Insérer le planning initial de plusieurs voitures en un seul INSERT
+        groupé, dans la transaction en cours (pas de commit)
+        
+        Args:
+            car_ids (List[int]): Identifiants des voitures
+            last_done_date (datetime, optional): Date de dernière maintenance
+        
+        Returns:
+            int: Nombre d'enregistrements créés
+        """
+        rows = cls.build_initial_schedule(car_ids, last_done_date)
+        if rows:
+            db.session.execute(insert(MaintenanceRecord), rows)
+        return len(rows)
+
+    HISTORY_PAGE_SIZE = 50
+    HISTORY_MAX_PAGE_SIZE = 200
+
+    @classmethod
+    @read_only
+    def get_maintenance_history(cls, car_id: int, include_archived: bool = False) -> List[Dict]:
         """
         Récupérer l'historique complet des maintenances pour une voiture
         
         Args:
             car_id (int): Identifiant de la voiture
+            include_archived (bool): Inclure les enregistrements archivés
+        
+        Returns:
+            List[Dict]: Liste des enregistrements de maintenance
+        """
+        history = cls._history_query(car_id, include_archived).subquery()
+        rows = db.session.execute(
+            select(history).order_by(history.c.next_due_date.desc(), history.c.id.desc())
+        ).all()
+
+        return [cls._serialize_history_row(row) for row in rows]
+
+    @classmethod
+    @read_only
+    def get_maintenance_history_page(
+        cls,
+        car_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_archived: bool = False
+    ) -> Dict:
+        """
+        Récupérer une page de l'historique d'une voiture (pagination par curseur
+        sur next_due_date décroissant, puis id)
+
+        Les pages sont mises en cache par voiture ; le cache d'une voiture est
+        invalidé dès qu'une de ses maintenances est créée, modifiée ou supprimée.
+        Un client tenu de lire sur le primaire (il vient d'écrire) contourne le
+        cache, qui peut contenir une page lue sur un réplica en retard.
+        
+        Args:
+            car_id (int): Identifiant de la voiture
+            limit (int, optional): Taille de la page
+            cursor (str, optional): Curseur renvoyé par la page précédente
+            include_archived (bool): Inclure les enregistrements archivés
         
         Returns:
-            List[MaintenanceRecord]: Liste des enregistrements de maintenance
+            Dict: {'items': [...], 'next_cursor': str ou None}
         """
-        return MaintenanceRecord.query.filter_by(car_id=car_id).order_by(
-            MaintenanceRecord.next_due_date.desc()
+        limit = min(limit or cls.HISTORY_PAGE_SIZE, cls.HISTORY_MAX_PAGE_SIZE)
+        if limit <= 0:
+            raise ValueError("La taille de page doit être positive")
+
+        cache_key = (limit, cursor, include_archived)
+        use_cache = not primary_required(db.session)
+        if use_cache:
+            page = maintenance_history_cache.get(car_id, cache_key)
+            if page is not None:
+                return page
+
+        before = cls._decode_history_cursor(cursor) if cursor else None
+        history = cls._history_query(car_id, include_archived, before).subquery()
+        rows = db.session.execute(
+            select(history)
+            .order_by(history.c.next_due_date.desc(), history.c.id.desc())
+            .limit(limit + 1)
         ).all()
 
+        items = [cls._serialize_history_row(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = f"{last.next_due_date.isoformat()}_{last.id}"
+
+        page = {'items': items, 'next_cursor': next_cursor}
+        if use_cache:
+            maintenance_history_cache.set(
+                car_id,
+                cache_key,
+                page,
+                current_app.config.get('HISTORY_CACHE_TTL_SECONDS')
+            )
+        return page
+
+    @staticmethod
+    def _decode_history_cursor(cursor: str):
+        try:
+            due_date, record_id = cursor.split('_')
+            return datetime.strptime(due_date, '%Y-%m-%d').date(), int(record_id)
+        except ValueError:
+            raise ValueError(f"Curseur invalide: {cursor}")
+
+    @staticmethod
+    def _serialize_history_row(row) -> Dict:
+        return {
+            'maintenance_id': row.id,
+            'car_id': row.car_id,
+            'maintenance_type': row.type,
+            'last_done_date': row.last_done_date,
+            'next_due_date': row.next_due_date,
+            'status': row.status,
+            'archived': bool(row.archived)
+        }
+
+    @classmethod
+    def _history_query(cls, car_id: int, include_archived: bool = False, before=None):
+        """
+        Requête de l'historique d'une voiture : table chaude, et archive
+        (UNION ALL) uniquement si demandé
+
+        Le filtre du curseur est appliqué dans chaque branche pour profiter
+        de l'index (car_id, next_due_date, id).
+        """
+        def columns(model, id_column, archived):
+            query = select(
+                id_column.label('id'),
+                model.car_id,
+                model.type,
+                model.last_done_date,
+                model.next_due_date,
+                model.status,
+                literal(archived).label('archived')
+            ).where(model.car_id == car_id)
+
+            if before is not None:
+                due_date, record_id = before
+                query = query.where(or_(
+                    model.next_due_date < due_date,
+                    and_(model.next_due_date == due_date, id_column < record_id)
+                ))
+            return query
+
+        hot = columns(MaintenanceRecord, MaintenanceRecord.id, False)
+        if not include_archived:
+            return hot
+        return union_all(hot, columns(MaintenanceRecordArchive, MaintenanceRecordArchive.source_id, True))
+
     @classmethod
+    @coalesce()
+    @read_only
     def get_upcoming_maintenances(cls, days_ahead: int = 30) -> List[Dict]:
         """
         Récupérer les maintenances à venir dans les prochains jours
@@ -148,6 +325,7 @@ class MaintenanceService:
         
         try:
             db.session.commit()
+            maintenance_history_cache.invalidate(record.car_id)
             return record
         except Exception as e:
             db.session.rollback()
@@ -166,15 +344,18 @@ class MaintenanceService:
         """
         record = MaintenanceRecord.query.get_or_404(maintenance_id)
         
+        car_id = record.car_id
         try:
             db.session.delete(record)
             db.session.commit()
+            maintenance_history_cache.invalidate(car_id)
             return True
         except Exception as e:
             db.session.rollback()
             return False
 
     @classmethod
+    @read_only
     def get_maintenance_stats(cls) -> Dict:
         """
         Générer des statistiques sur les maintenances
@@ -201,6 +382,8 @@ class MaintenanceService:
             'overdue_maintenances': overdue_maintenances
         }
     @classmethod
+    @coalesce()
+    @read_only
     def get_all_cars(cls) -> List[Dict]:
         """
         Récupérer toutes les voitures existantes dans la base de données
@@ -225,6 +408,8 @@ class MaintenanceService:
             for car in cars
         ]
     @classmethod
+    @coalesce()
+    @read_only
     def get_all_maintenances(cls) -> List[Dict]:
         """
         Récupérer tous les enregistrements de maintenance de la base de données.
@@ -249,6 +434,7 @@ class MaintenanceService:
         ]
 
     @classmethod
+    @read_only
     def get_completed_maintenances(cls, car_id: Optional[int] = None) -> List[Dict]:
         try:
             today = datetime.today().date()  # Récupérer la date d'aujourd'hui
@@ -278,13 +464,15 @@ class MaintenanceService:
                 for maintenance, car in completed_maintenances
             ]
             
-            print("Résultat des maintenances complétées par date:", result)  # Debug
+            logger.debug("Maintenances complétées récupérées", extra={'car_id': car_id, 'count': len(result)})
             return result
-        except Exception as e:
-            print("Erreur dans get_completed_maintenances:", str(e))
+        except Exception:
+            logger.exception("Erreur dans get_completed_maintenances")
             return []
 
     @classmethod
+    @coalesce()
+    @read_only
     def get_overdue_maintenances(cls) -> List[Dict]:
         """
         Récupérer toutes les maintenances en retard
@@ -311,11 +499,13 @@ class MaintenanceService:
                 }
                 for maintenance, car in overdue_maintenances
             ]
-        except Exception as e:
-            print("Erreur dans get_overdue_maintenances:", str(e))
+        except Exception:
+            logger.exception("Erreur dans get_overdue_maintenances")
             return []
 
     @classmethod
+    @coalesce()
+    @read_only
     def get_monthly_summary(cls, year: int, month: int) -> Dict:
         """
         Récupérer un résumé mensuel des maintenances
@@ -337,10 +527,15 @@ class MaintenanceService:
             'upcoming_maintenances': upcoming
         }
     @classmethod
+    @coalesce()
+    @read_only
     def get_brand_maintenance_stats(cls) -> Dict:
         """
         Statistiques de maintenance par marque de voiture
         """
+        if fleet_snapshot.is_enabled():
+            return fleet_snapshot.get_brand_maintenance_stats()
+
         stats = db.session.query(
             Car.brand,
             func.count(MaintenanceRecord.id),
@@ -357,10 +552,15 @@ class MaintenanceService:
 
 
     @classmethod
+    @coalesce()
+    @read_only
     def get_maintenance_status_distribution(cls) -> Dict:
         """
         Statistiques de répartition des statuts de maintenance
         """
+        if fleet_snapshot.is_enabled():
+            return fleet_snapshot.get_maintenance_status_distribution()
+
         status_counts = db.session.query(
             MaintenanceRecord.status,
             func.count(MaintenanceRecord.id)
@@ -404,8 +604,8 @@ class MaintenanceService:
             # Stocker le JTI dans Redis avec une expiration
             self._redis_client.set(f'token_blacklist:{jti}', 'true', ex=exp)
             return True
-        except Exception as e:
-            print(f"Erreur lors de la déconnexion: {str(e)}")
+        except Exception:
+            logger.exception("Erreur lors de la déconnexion")
             return False
 
     
\ No newline at end of file
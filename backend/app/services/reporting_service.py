@@ -1,10 +1,14 @@
-from models import Car, MaintenanceRecord
+from models import db, Car, MaintenanceRecord
 from sqlalchemy import func
+from services.fleet_snapshot import fleet_snapshot
 
 class ReportingService:
     @staticmethod
     def get_maintenance_summary():
         """Générer un rapport récapitulatif des maintenances"""
+        if fleet_snapshot.is_enabled():
+            return fleet_snapshot.get_maintenance_summary()
+
         # Total de voitures
         total_cars = Car.query.count()
 
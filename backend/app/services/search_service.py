@@ -0,0 +1,166 @@
+# backend/services/search_service.py
+import threading
+from bisect import bisect_left, insort
+from sqlalchemy import func
+from typing import Dict, List, Optional, Tuple
+from models import db, Car
+
+class CarSearchIndex:
+    """
+    Index de préfixes en mémoire sur plate_number, brand et model.
+
+    Chaque champ est stocké dans un tableau trié de tuples (clé, car_id) :
+    une recherche par préfixe est une recherche dichotomique suivie d'un
+    parcours des entrées contiguës, sans toucher la base de données.
+
+    Les modifications faites par ce processus sont appliquées directement ;
+    celles des autres processus (workers, commandes CLI) sont détectées en
+    tâche de fond (refresh_if_changed, appelé par le scheduler) par
+    comparaison du nombre de voitures et du dernier updated_at. Les
+    recherches ne touchent jamais la base après le premier chargement et
+    continuent sur l'ancien index pendant un rechargement.
+    """
+
+    SEARCH_FIELDS = ('plate_number', 'brand', 'model')
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._entries: Dict[str, List[Tuple[str, int]]] = {field: [] for field in self.SEARCH_FIELDS}
+        self._cars: Dict[int, Dict] = {}
+        self._loaded = False
+        self._version = None
+
+    @staticmethod
+    def _normalize(value) -> str:
+        return str(value or '').strip().lower()
+
+    @staticmethod
+    def _car_summary(car) -> Dict:
+        return {
+            'id': car.id,
+            'plate_number': car.plate_number,
+            'brand': car.brand,
+            'model': car.model
+        }
+
+    @staticmethod
+    def _table_version() -> Tuple:
+        """Nombre de voitures et dernière modification"""
+        return tuple(db.session.query(func.count(Car.id), func.max(Car.updated_at)).one())
+
+    def load(self):
+        """Construire l'index à partir de la table des voitures"""
+        version = self._table_version()
+        rows = db.session.query(Car.id, Car.plate_number, Car.brand, Car.model).all()
+
+        entries = {field: [] for field in self.SEARCH_FIELDS}
+        cars = {}
+        for row in rows:
+            cars[row.id] = self._car_summary(row)
+            for field in self.SEARCH_FIELDS:
+                entries[field].append((self._normalize(getattr(row, field)), row.id))
+
+        for field in self.SEARCH_FIELDS:
+            entries[field].sort()
+
+        with self._lock:
+            self._entries = entries
+            self._cars = cars
+            self._version = version
+            self._loaded = True
+
+    def ensure_loaded(self):
+        """Charger l'index au premier usage (un seul chargement à la fois)"""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self.load()
+
+    def refresh_if_changed(self) -> bool:
+        """
+        Recharger l'index si la table des voitures a changé depuis le
+        dernier chargement (tâche de fond, hors du chemin des recherches)
+
+        Returns:
+            bool: True si l'index a été rechargé
+        """
+        if not self._loaded:
+            return False
+        with self._load_lock:
+            if self._table_version() == self._version:
+                return False
+            self.load()
+            return True
+
+    def _remove_entries(self, car_id: int):
+        car = self._cars.pop(car_id, None)
+        if not car:
+            return
+        for field in self.SEARCH_FIELDS:
+            entries = self._entries[field]
+            key = (self._normalize(car[field]), car_id)
+            position = bisect_left(entries, key)
+            if position < len(entries) and entries[position] == key:
+                del entries[position]
+
+    def upsert(self, car):
+        """Ajouter ou mettre à jour une voiture dans l'index"""
+        if not self._loaded:
+            return
+        with self._lock:
+            self._remove_entries(car.id)
+            self._cars[car.id] = self._car_summary(car)
+            for field in self.SEARCH_FIELDS:
+                insort(self._entries[field], (self._normalize(getattr(car, field)), car.id))
+
+    def remove(self, car_id: int):
+        """Retirer une voiture de l'index"""
+        if not self._loaded:
+            return
+        with self._lock:
+            self._remove_entries(car_id)
+
+    def search(self, query: str, limit: int = 10, field: Optional[str] = None) -> List[Dict]:
+        """
+        Rechercher les voitures dont un champ commence par le préfixe donné
+
+        Args:
+            query (str): Préfixe recherché (insensible à la casse)
+            limit (int): Nombre maximum de résultats
+            field (str, optional): Restreindre la recherche à un seul champ
+
+        Returns:
+            List[Dict]: Voitures correspondantes (plaque d'abord, puis marque, puis modèle)
+        """
+        prefix = self._normalize(query)
+        if not prefix or limit <= 0:
+            return []
+        if field is not None and field not in self.SEARCH_FIELDS:
+            raise ValueError(f"Champ de recherche invalide: {field}")
+
+        self.ensure_loaded()
+        fields = (field,) if field else self.SEARCH_FIELDS
+
+        results = []
+        seen = set()
+        with self._lock:
+            for name in fields:
+                entries = self._entries[name]
+                position = bisect_left(entries, (prefix, -1))
+                while position < len(entries) and len(results) < limit:
+                    key, car_id = entries[position]
+                    if not key.startswith(prefix):
+                        break
+                    if car_id not in seen:
+                        seen.add(car_id)
+                        results.append(dict(self._cars[car_id]))
+                    position += 1
+                if len(results) >= limit:
+                    break
+
+        return results
+
+
+car_search_index = CarSearchIndex()
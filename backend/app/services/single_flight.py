@@ -0,0 +1,113 @@
+# backend/services/single_flight.py
+import threading
+from collections import defaultdict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional
+from flask import current_app, has_app_context
+from models import db
+from db_routing import primary_required
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Regroupement des appels identiques simultanés : le premier appel
+    (leader) exécute la requête, les appels identiques arrivés pendant son
+    exécution attendent et reçoivent le même résultat.
+
+    Rien n'est mis en cache : une fois le leader terminé, l'appel suivant
+    relance une exécution.
+    """
+
+    DEFAULT_TIMEOUT_SECONDS = 10
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats = defaultdict(lambda: {'executions': 0, 'coalesced': 0, 'timeouts': 0})
+
+    def do(self, name: str, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """
+        Exécuter fn une seule fois pour tous les appels simultanés de même clé
+
+        Args:
+            name (str): Nom de la méthode (pour les compteurs)
+            key (Hashable): Clé d'appel (méthode + arguments)
+            fn (Callable): Exécution réelle
+            timeout (float, optional): Attente maximale d'un appel regroupé ;
+                au-delà, l'appel exécute sa propre requête
+
+        Returns:
+            Any: Résultat de fn
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._stats[name]['executions'] += 1
+
+        if leader:
+            try:
+                call.result = fn()
+                return call.result
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+
+        if not call.event.wait(timeout if timeout is not None else self.DEFAULT_TIMEOUT_SECONDS):
+            with self._lock:
+                self._stats[name]['timeouts'] += 1
+                self._stats[name]['executions'] += 1
+            return fn()
+
+        with self._lock:
+            self._stats[name]['coalesced'] += 1
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: dict(counters) for name, counters in self._stats.items()}
+
+
+single_flight = SingleFlight()
+
+
+def coalesce(timeout: Optional[float] = None):
+    """
+    Décorateur : regrouper les appels simultanés de la méthode ayant les
+    mêmes arguments. A placer sous @classmethod.
+
+    La clé inclut le routage de la lecture : un client tenu de lire sur le
+    primaire (il vient d'écrire) ne rejoint jamais un appel servi par un
+    réplica. SINGLE_FLIGHT_ENABLED = False désactive le regroupement.
+    """
+    def decorator(func):
+        name = func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not has_app_context() or not current_app.config.get('SINGLE_FLIGHT_ENABLED', True):
+                return func(*args, **kwargs)
+
+            key = (name, primary_required(db.session), args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return func(*args, **kwargs)
+            return single_flight.do(name, key, lambda: func(*args, **kwargs), timeout)
+
+        return wrapper
+    return decorator
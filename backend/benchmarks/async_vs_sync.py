@@ -0,0 +1,146 @@
+"""
+Comparaison du chemin de lecture synchrone (Flask, pool de threads) et
+asynchrone (Quart + AsyncSession) sous forte concurrence, sur une base
+SQLite locale (aiosqlite pour le chemin asynchrone).
+
+    cd backend && python benchmarks/async_vs_sync.py --cars 2000 --concurrency 200 --workers 16
+
+Chaque scénario lance --concurrency requêtes simultanées par route ; le
+chemin synchrone ne peut en traiter que --workers à la fois (un thread par
+requête, comme un serveur WSGI), le chemin asynchrone les multiplexe sur
+une seule boucle d'événements.
+
+Le regroupement des lectures identiques (@coalesce) est désactivé côté
+synchrone : les requêtes du scénario étant identiques, il mesurerait sinon
+le single-flight et non le chemin de lecture synchrone.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+from flask import Flask
+from flask_jwt_extended import JWTManager
+from models import db, Car, MaintenanceRecord
+from routes import car_routes
+from async_app import create_async_app
+
+ROUTES = [
+    '/api/maintenance/upcoming',
+    '/api/reports/overdue',
+    '/api/reports/status-distribution',
+    '/api/get-cars'
+]
+
+MAINTENANCE_TYPES = ['oil_change', 'technical_inspection', 'insurance']
+
+
+def create_sync_app(database_path):
+    app = Flask(__name__)
+    app.config.from_object('config.Config')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{database_path}'
+    app.config['SQLALCHEMY_BINDS'] = {}
+    app.config['SQLALCHEMY_REPLICA_BINDS'] = []
+    app.config['SINGLE_FLIGHT_ENABLED'] = False
+    app.config['JWT_SECRET_KEY'] = 'benchmark'
+    JWTManager(app)
+    db.init_app(app)
+    app.register_blueprint(car_routes, url_prefix='/api')
+    return app
+
+
+def seed(app, cars):
+    today = date.today()
+    with app.app_context():
+        db.create_all()
+        for i in range(cars):
+            db.session.add(Car(
+                plate_number=f'BENCH-{i:06d}',
+                brand=['Dacia', 'Renault', 'Toyota', 'Peugeot'][i % 4],
+                model=f'M{i % 7}',
+                year=2015 + i % 10
+            ))
+        db.session.flush()
+        car_ids = [car_id for (car_id,) in db.session.query(Car.id)]
+        db.session.add_all(
+            MaintenanceRecord(
+                car_id=car_id,
+                type=maintenance_type,
+                last_done_date=today - timedelta(days=(car_id * 37 + offset * 11) % 400),
+                next_due_date=today + timedelta(days=(car_id * 53 + offset * 17) % 400 - 200)
+            )
+            for car_id in car_ids
+            for offset, maintenance_type in enumerate(MAINTENANCE_TYPES)
+        )
+        db.session.commit()
+
+
+def summarize(label, route, latencies, elapsed):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<6} {route:<36} {len(latencies) / elapsed:>9.1f} req/s"
+        f"  p50 {statistics.median(latencies) * 1000:>8.1f} ms"
+        f"  p95 {p95 * 1000:>8.1f} ms"
+    )
+
+
+def run_sync(app, route, concurrency, workers):
+    def call(submitted_at):
+        response = app.test_client().get(route)
+        assert response.status_code == 200, response.status_code
+        return time.perf_counter() - submitted_at
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        latencies = list(executor.map(call, [start] * concurrency))
+    summarize('sync', route, latencies, time.perf_counter() - start)
+
+
+async def run_async(app, route, concurrency):
+    client = app.test_client()
+
+    async def call(submitted_at):
+        response = await client.get(route)
+        assert response.status_code == 200, response.status_code
+        return time.perf_counter() - submitted_at
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*[call(start) for _ in range(concurrency)])
+    summarize('async', route, latencies, time.perf_counter() - start)
+
+
+async def run_async_suite(database_path, concurrency):
+    app = create_async_app(f'sqlite+aiosqlite:///{database_path}')
+    async with app.test_app():
+        for route in ROUTES:
+            await run_async(app, route, concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cars', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=16, help='Threads du chemin synchrone')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = os.path.join(directory, 'benchmark.db')
+        sync_app = create_sync_app(database_path)
+        seed(sync_app, args.cars)
+
+        print(f"{args.cars} voitures, {args.concurrency} requêtes simultanées, {args.workers} threads synchrones")
+        for route in ROUTES:
+            run_sync(sync_app, route, args.concurrency, args.workers)
+        asyncio.run(run_async_suite(database_path, args.concurrency))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Coût CPU de la compression face aux octets économisés, sur des charges
+JSON de la forme de /get-cars, /maintenance/all et /reports/overdue.
+
+    cd backend && python benchmarks/compression.py --rows 20000
+
+Les algorithmes br et zstd ne sont mesurés que si les paquets brotli et
+zstandard sont installés.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+from flask import Flask
+from compression import COMPRESSORS, compress
+
+LEVELS = {
+    'gzip': [1, 6, 9],
+    'br': [1, 4, 6, 11],
+    'zstd': [1, 3, 10, 19]
+}
+
+BRANDS = ['Dacia', 'Renault', 'Toyota', 'Peugeot', 'Hyundai', 'Volkswagen']
+MAINTENANCE_TYPES = ['oil_change', 'technical_inspection', 'insurance']
+
+
+def build_payloads(rows):
+    """Charges sérialisées comme jsonify le ferait"""
+    app = Flask(__name__)
+    today = date.today()
+
+    cars = [
+        {
+            'id': i,
+            'plate_number': f'{10000 + i}-A-{i % 90}',
+            'brand': BRANDS[i % len(BRANDS)],
+            'model': f'Model {i % 12}',
+            'year': 2012 + i % 12,
+            'mileage': (i * 7919) % 250000,
+            'status': 'available',
+            'created_at': datetime(2024, 1, 1) + timedelta(minutes=i),
+            'updated_at': datetime(2024, 6, 1) + timedelta(minutes=i)
+        }
+        for i in range(rows)
+    ]
+    maintenances = [
+        {
+            'maintenance_id': i,
+            'car_id': i // 3,
+            'plate_number': f'{10000 + i // 3}-A-{(i // 3) % 90}',
+            'brand': BRANDS[(i // 3) % len(BRANDS)],
+            'model': f'Model {(i // 3) % 12}',
+            'maintenance_type': MAINTENANCE_TYPES[i % 3],
+            'last_done_date': today - timedelta(days=i % 365),
+            'next_due_date': today + timedelta(days=180 - i % 365)
+        }
+        for i in range(rows)
+    ]
+    overdue = [
+        {**maintenance, 'days_overdue': (today - maintenance['next_due_date']).days}
+        for maintenance in maintenances
+        if maintenance['next_due_date'] < today
+    ]
+
+    with app.app_context():
+        return {
+            '/get-cars': app.json.dumps(cars).encode('utf-8'),
+            '/maintenance/all': app.json.dumps(maintenances).encode('utf-8'),
+            '/reports/overdue': app.json.dumps(overdue).encode('utf-8')
+        }
+
+
+def measure(data, encoding, level, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compressed = compress(data, encoding, level)
+        timings.append(time.perf_counter() - start)
+    return min(timings), len(compressed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for route, data in build_payloads(args.rows).items():
+        print(f"\n{route}: {len(data) / 1024:.0f} KiB non compressé")
+        print(f"{'algo':<6}{'niveau':>7}{'ms':>10}{'Mo/s':>9}{'KiB':>10}{'ratio':>8}{'économisé':>12}")
+        for encoding in COMPRESSORS:
+            for level in LEVELS[encoding]:
+                elapsed, size = measure(data, encoding, level, args.repeat)
+                print(
+                    f"{encoding:<6}{level:>7}{elapsed * 1000:>10.1f}"
+                    f"{len(data) / elapsed / 1e6:>9.1f}{size / 1024:>10.0f}"
+                    f"{len(data) / size:>8.1f}{(1 - size / len(data)) * 100:>11.1f}%"
+                )
+
+
+if __name__ == '__main__':
+    main()